@@ -5,6 +5,7 @@ Shared pytest fixtures for metasystem-core testing.
 This module provides reusable fixtures for all tests.
 """
 
+import os
 import pytest
 import tempfile
 import shutil
@@ -21,13 +22,66 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from knowledge_graph import KnowledgeGraph
 
 
+# ============================================================================
+# Session Configuration
+# ============================================================================
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    """Put tmp_path directories on tmpfs (/dev/shm) when available.
+
+    Runs before pytest creates its temp root. Skipped when TMPDIR or
+    --basetemp is set, or on systems without a writable /dev/shm (macOS).
+    """
+    shm = Path('/dev/shm')
+    if config.option.basetemp or os.environ.get('TMPDIR'):
+        return
+    if shm.is_dir() and os.access(shm, os.W_OK):
+        tempfile.tempdir = str(shm)
+
+
 # ============================================================================
 # Database Fixtures
 # ============================================================================
 
 @pytest.fixture
-def tmp_kg(tmp_path):
-    """Create temporary KnowledgeGraph for testing.
+def tmp_kg():
+    """Create temporary in-memory KnowledgeGraph for testing.
+
+    Yields:
+        KnowledgeGraph: Fresh, empty knowledge graph backed by ":memory:"
+    """
+    kg = KnowledgeGraph(":memory:")
+    yield kg
+    kg.close()
+
+
+@pytest.fixture(scope="class")
+def readonly_kg():
+    """Class-scoped in-memory KnowledgeGraph shared by read-only tests.
+
+    Seeded with a single project entity. Tests using it must not write;
+    mark them ``@pytest.mark.readonly``.
+
+    Yields:
+        KnowledgeGraph: Knowledge graph holding one project entity
+    """
+    kg = KnowledgeGraph(":memory:")
+    kg.insert_entity({
+        'id': 'readonly-project',
+        'type': 'project',
+        'name': 'readonly-project',
+        'path': '/Users/test/Workspace/readonly-project'
+    })
+    yield kg
+    kg.close()
+
+
+@pytest.fixture
+def disk_kg(tmp_path):
+    """Create temporary on-disk KnowledgeGraph for testing.
+
+    Use for tests that depend on file-backed behaviour (VACUUM, page counts).
 
     Yields:
         KnowledgeGraph: Fresh, empty knowledge graph in temporary location
@@ -35,7 +89,8 @@ def tmp_kg(tmp_path):
     db_path = tmp_path / "test.db"
     kg = KnowledgeGraph(str(db_path))
     yield kg
-    # Cleanup handled automatically by tmp_path
+    kg.close()
+    # File cleanup handled automatically by tmp_path
 
 
 @pytest.fixture
@@ -351,6 +406,8 @@ def make_test_conversation(**kwargs) -> Dict[str, Any]:
 # Export helper functions
 __all__ = [
     'tmp_kg',
+    'readonly_kg',
+    'disk_kg',
     'populated_kg',
     'kg_with_relationships',
     'tmp_workspace',
@@ -111,6 +111,7 @@ class ConversationManager:
         Args:
             conv_id: Conversation ID
         """
+        # Written straight away: resumes are rare, and duration reads it back
         self.kg.update_conversation(conv_id, {
             'last_message_at': datetime.now().isoformat()
         })
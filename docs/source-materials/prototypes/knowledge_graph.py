@@ -10,48 +10,260 @@ Critical component - everything depends on this being rock-solid.
 
 import sqlite3
 import json
+import threading
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
+from collections import deque
 from contextlib import contextmanager
+from functools import lru_cache
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# SQLite 3.45+ stores JSON as binary JSONB, so reads skip text parsing.
+# Older versions keep plain JSON text; both read back through json().
+JSONB_SUPPORTED = sqlite3.sqlite_version_info >= (3, 45, 0)
+_JSON_PARAM = "jsonb(?)" if JSONB_SUPPORTED else "?"
+_METADATA_COLUMN = (
+    "json(entities.metadata) AS metadata" if JSONB_SUPPORTED else "entities.metadata"
+)
+
+# Entity columns returned to callers (excludes generated columns)
+_ENTITY_COLUMNS = (
+    "entities.id, entities.type, entities.path, entities.name, " + _METADATA_COLUMN +
+    ", entities.embedding, entities.created_at, entities.updated_at, entities.last_seen"
+)
+
+_INSERT_ENTITY_SQL = f"""
+    INSERT INTO entities (id, type, path, name, metadata, embedding,
+                          created_at, updated_at, last_seen)
+    VALUES (?, ?, ?, ?, {_JSON_PARAM}, ?, ?, ?, ?)
+"""
+_INSERT_FTS_SQL = """
+    INSERT INTO entities_fts (id, type, name, content)
+    VALUES (?, ?, ?, ?)
+"""
+
+# Columns stored as JSON text and decoded when rows are returned
+_JSON_FIELDS = ('metadata', 'context', 'state', 'snapshot', 'sync_metadata')
+
+# Folds accents (café matches cafe) on top of stemming; databases built
+# with an older tokenizer are re-indexed by _migrate_schema
+_FTS_TOKENIZER = "porter unicode61 remove_diacritics 2"
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a value to JSON text, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(value)
+
+
+_json_loads = orjson.loads if HAS_ORJSON else json.loads
+
+
+@lru_cache(maxsize=32)
+def _search_sql(n_types: int) -> str:
+    """Build the search() statement for a given number of type filters.
+
+    Args:
+        n_types: Number of bound entity types (0 for no type filter)
+
+    Returns:
+        SQL text taking the MATCH query, the types, then the limit
+    """
+    type_filter = ""
+    if n_types:
+        type_filter = f"AND entities.type IN ({', '.join('?' * n_types)})"
+
+    return f"""
+        SELECT {_ENTITY_COLUMNS}
+        FROM entities
+        JOIN entities_fts ON entities.id = entities_fts.id
+        WHERE entities_fts MATCH ?
+        {type_filter}
+        ORDER BY entities_fts.rank
+        LIMIT ?
+    """
+
+
+class _PendingInsert:
+    """An insert_entity() call waiting for a combining thread to write it."""
+
+    __slots__ = ('entity_row', 'fts_row', 'done', 'error')
+
+    def __init__(self, entity_row: Tuple, fts_row: Tuple):
+        self.entity_row = entity_row
+        self.fts_row = fts_row
+        self.done = False
+        self.error: Optional[Exception] = None
 
 
 class KnowledgeGraph:
     """SQLite-based knowledge graph with full-text search."""
 
+    # last_seen / last_message_at coalescing (seconds)
+    LAST_SEEN_FLUSH_INTERVAL = 30.0
+    LAST_SEEN_THRESHOLD = 60.0
+
+    # Most queued insert_entity() calls written in one transaction
+    INSERT_BATCH_SIZE = 500
+
+    # FTS5 pages of segment merging done after a bulk_load(defer_fts=True)
+    BULK_LOAD_MERGE_PAGES = 500
+
     def __init__(self, db_path: str = None):
         """Initialize knowledge graph.
 
         Args:
-            db_path: Path to SQLite database. Defaults to ~/.metasystem/metastore.db
+            db_path: Path to SQLite database, or ":memory:" for a private
+                in-memory database. Defaults to ~/.metasystem/metastore.db
         """
         if db_path is None:
             db_path = str(Path.home() / ".metasystem" / "metastore.db")
 
         self.db_path = db_path
 
-        # Ensure directory exists
-        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        # Pending last_seen / last_message_at writes, flushed in one batch
+        self._pending_last_seen: Dict[str, datetime] = {}
+        self._pending_last_message: Dict[str, datetime] = {}
+        self._pending_lock = threading.Lock()
+        # Background flush, armed by the first touch after each flush
+        self._flush_timer: Optional[threading.Timer] = None
+
+        # insert_entity() calls from concurrent threads, combined into batches
+        self._insert_queue: deque = deque()
+
+        if db_path == ':memory:':
+            needs_init = True
+        else:
+            # Ensure directory exists
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            needs_init = not Path(db_path).exists()
+
+        # One long-lived connection so prepared statements stay cached.
+        # Transactions are managed explicitly in _get_conn().
+        self.conn = sqlite3.connect(
+            db_path,
+            timeout=30.0,  # busy_timeout: wait for other processes' locks
+            cached_statements=512,
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self.conn.row_factory = sqlite3.Row  # Return dict-like rows
+        self.conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign keys
+        if db_path != ':memory:':
+            # Readers don't block the writer; WAL makes NORMAL sync crash-safe
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            # Read pages straight from a 256 MB memory map instead of read() calls
+            self.conn.execute("PRAGMA mmap_size = 268435456")
+        self.conn.execute("PRAGMA cache_size = -20000")  # ~20 MB page cache
+        self.conn.execute("PRAGMA temp_store = MEMORY")  # Sorts/temp indexes in RAM
+        self._conn_lock = threading.RLock()
+        # Thread inside batch(); other threads wait for it to finish
+        self._batch_owner: Optional[int] = None
+        self._batch_done = threading.Condition(self._conn_lock)
 
         # Initialize if needed
-        if not Path(db_path).exists():
+        if needs_init:
             self._init_schema()
+        else:
+            self._migrate_schema()
+
+    @contextmanager
+    def _lock_conn(self):
+        """Hold the connection lock, first waiting out another thread's batch()."""
+        with self._conn_lock:
+            while self._batch_owner not in (None, threading.get_ident()):
+                self._batch_done.wait()
+            yield
 
     @contextmanager
     def _get_conn(self):
-        """Get database connection with context manager."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return dict-like rows
-        conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign keys
+        """Get the shared connection inside a transaction.
+
+        Nested calls (and callers that already opened a transaction or
+        savepoint) join the enclosing transaction under a savepoint, so a
+        failure undoes only this call's writes.
+        """
+        with self._lock_conn():
+            if self.conn.in_transaction:
+                self.conn.execute("SAVEPOINT get_conn")
+                try:
+                    yield self.conn
+                except BaseException:
+                    self.conn.execute("ROLLBACK TO get_conn")
+                    self.conn.execute("RELEASE get_conn")
+                    raise
+                self.conn.execute("RELEASE get_conn")
+                return
+
+            # BaseException too: an interrupt must not leave the shared
+            # connection inside an open transaction
+            self.conn.execute("BEGIN")
+            try:
+                yield self.conn
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    @contextmanager
+    def batch(self):
+        """Group this thread's writes into a single transaction.
+
+        Calls made inside the block join this transaction, so the whole
+        batch commits once. Any exception rolls back every write in the
+        batch. Other threads wait until the batch ends rather than joining
+        it. Nested batches join the enclosing one.
+
+        Yields:
+            This KnowledgeGraph
+        """
+        with self._lock_conn():
+            if self.conn.in_transaction:
+                owner = False
+            else:
+                self.conn.execute("BEGIN")
+                self._batch_owner = threading.get_ident()
+                owner = True
+
+        if not owner:
+            yield self
+            return
+
         try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            conn.rollback()
-            raise e
-        finally:
-            conn.close()
+            yield self
+        except BaseException:
+            self._end_batch("ROLLBACK")
+            raise
+
+        self._end_batch("COMMIT")
+
+    def _end_batch(self, statement: str):
+        """Commit or roll back the open batch and wake waiting threads."""
+        with self._conn_lock:
+            try:
+                self.conn.execute(statement)
+            finally:
+                self._batch_owner = None
+                self._batch_done.notify_all()
+
+    def close(self):
+        """Flush pending writes and close the database connection."""
+        with self._pending_lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.cancel()
+        self.flush_last_seen()
+        with self._lock_conn():
+            self.conn.close()
 
     def _init_schema(self):
         """Initialize database schema."""
@@ -67,27 +279,24 @@ class KnowledgeGraph:
                     embedding BLOB,
                     created_at TEXT NOT NULL,
                     updated_at TEXT NOT NULL,
-                    last_seen TEXT NOT NULL
+                    last_seen TEXT NOT NULL,
+                    language TEXT GENERATED ALWAYS AS
+                        (json_extract(metadata, '$.language')) VIRTUAL
                 )
             """)
 
             # Create indexes for common queries
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_type ON entities(type)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_path ON entities(path)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_name ON entities(name)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_entities_last_seen ON entities(last_seen)")
-
-            # Full-text search table
             conn.execute("""
-                CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
-                    id UNINDEXED,
-                    type,
-                    name,
-                    content,
-                    tokenize = 'porter unicode61'
-                )
+                CREATE INDEX IF NOT EXISTS idx_entities_language ON entities(language)
+                WHERE language IS NOT NULL
             """)
 
+            # Full-text search table
+            self._create_fts_table(conn)
+
             # Relationships table
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS relationships (
@@ -102,8 +311,6 @@ class KnowledgeGraph:
                 )
             """)
 
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_rel_source ON relationships(source_id)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_rel_target ON relationships(target_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_rel_type ON relationships(rel_type)")
 
             # Conversations table
@@ -120,7 +327,6 @@ class KnowledgeGraph:
                 )
             """)
 
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_conv_tool ON conversations(tool)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_conv_started ON conversations(started_at)")
 
             # Facts table (auto-discovered metadata)
@@ -182,6 +388,98 @@ class KnowledgeGraph:
             conn.execute("CREATE INDEX IF NOT EXISTS idx_sync_machine ON sync_log(machine_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_sync_at ON sync_log(synced_at)")
 
+            self._create_composite_indexes(conn)
+
+            # Seed planner statistics so the composite indexes are preferred
+            conn.execute("ANALYZE")
+
+    def _create_composite_indexes(self, conn: sqlite3.Connection):
+        """Create the multi-column indexes used by the filtered list queries.
+
+        Each one leads with the equality filter and continues with the
+        ORDER BY / range column, so the query becomes a single index range
+        scan. They supersede the old single-column indexes on the same
+        leading column, which are dropped.
+
+        Args:
+            conn: Open database connection
+        """
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_entities_type_last_seen
+            ON entities(type, last_seen DESC)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_conv_tool_last_message
+            ON conversations(tool, last_message_at DESC)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_rel_source_type
+            ON relationships(source_id, rel_type)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_rel_target_type
+            ON relationships(target_id, rel_type)
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_facts_type_value
+            ON facts(fact_type, value)
+        """)
+
+        for redundant in ('idx_entities_type', 'idx_conv_tool', 'idx_rel_source', 'idx_rel_target',
+                          'idx_facts_type'):
+            conn.execute(f"DROP INDEX IF EXISTS {redundant}")
+
+    def _create_fts_table(self, conn: sqlite3.Connection):
+        """Create the FTS5 table used by search().
+
+        Args:
+            conn: Open database connection
+        """
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS entities_fts USING fts5(
+                id UNINDEXED,
+                type,
+                name,
+                content,
+                tokenize = '{_FTS_TOKENIZER}'
+            )
+        """)
+
+    def _migrate_schema(self):
+        """Bring databases created by older versions up to the current schema."""
+        with self._get_conn() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(entities)")}
+            if columns and 'language' not in columns:
+                conn.execute("""
+                    ALTER TABLE entities ADD COLUMN language TEXT GENERATED ALWAYS AS
+                        (json_extract(metadata, '$.language')) VIRTUAL
+                """)
+                conn.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_entities_language ON entities(language)
+                    WHERE language IS NOT NULL
+                """)
+            if columns:
+                self._create_composite_indexes(conn)
+
+            fts = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'entities_fts'"
+            ).fetchone()
+            if fts and _FTS_TOKENIZER not in fts['sql']:
+                # The tokenizer is fixed at creation time, so re-index from scratch
+                conn.execute("DROP TABLE entities_fts")
+                self._create_fts_table(conn)
+                entities = [
+                    self._row_to_dict(row)
+                    for row in conn.execute(f"SELECT {_ENTITY_COLUMNS} FROM entities")
+                ]
+                conn.executemany("""
+                    INSERT INTO entities_fts (id, type, name, content)
+                    VALUES (?, ?, ?, ?)
+                """, [
+                    (e['id'], e['type'], e.get('name') or '', self._extract_searchable_content(e))
+                    for e in entities
+                ])
+
     # =========================================================================
     # Entity CRUD Operations
     # =========================================================================
@@ -199,35 +497,134 @@ class KnowledgeGraph:
         now = datetime.now().isoformat()
         entity_id = entity.get('id', str(uuid.uuid4()))
 
-        with self._get_conn() as conn:
-            conn.execute("""
-                INSERT INTO entities (id, type, path, name, metadata, embedding,
-                                     created_at, updated_at, last_seen)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+        pending = _PendingInsert(
+            (
                 entity_id,
                 entity['type'],
                 entity.get('path'),
                 entity.get('name'),
-                json.dumps(entity.get('metadata', {})),
+                _json_dumps(entity.get('metadata', {})),
+                entity.get('embedding'),
+                now,
+                now,
+                now
+            ),
+            (entity_id, entity['type'], entity.get('name', ''),
+             self._extract_searchable_content(entity))
+        )
+
+        # Flat combining: whichever thread gets the connection writes every
+        # queued insert in one transaction, so concurrent callers share a commit
+        self._insert_queue.append(pending)
+        with self._lock_conn():
+            if not pending.done:
+                if self.conn.in_transaction:
+                    # Inside an open transaction (or batch()): write only this
+                    # row; _get_conn's savepoint undoes just this call on failure
+                    self._insert_queue.remove(pending)
+                    self._write_inserts([pending])
+                else:
+                    while not pending.done:
+                        batch = []
+                        while self._insert_queue and len(batch) < self.INSERT_BATCH_SIZE:
+                            batch.append(self._insert_queue.popleft())
+                        self._write_inserts(batch)
+
+        if pending.error is not None:
+            raise pending.error
+
+        return entity_id
+
+    def _write_inserts(self, batch: List[_PendingInsert]):
+        """Write queued entity inserts, recording per-call errors.
+
+        Args:
+            batch: Pending inserts to write in one transaction
+        """
+        try:
+            with self._get_conn() as conn:
+                conn.executemany(_INSERT_ENTITY_SQL, [p.entity_row for p in batch])
+                conn.executemany(_INSERT_FTS_SQL, [p.fts_row for p in batch])
+        except sqlite3.Error as e:
+            if len(batch) == 1:
+                batch[0].error = e
+            else:
+                # One bad row (e.g. a duplicate id) mustn't fail the others
+                for p in batch:
+                    self._write_inserts([p])
+                return
+
+        for p in batch:
+            p.done = True
+
+    def bulk_load(self, entities: List[Dict[str, Any]], defer_fts: bool = False) -> List[str]:
+        """Insert many entities in a single transaction.
+
+        Args:
+            entities: Entity dictionaries, as accepted by insert_entity
+            defer_fts: Suspend FTS segment merging during the load, then do
+                a bounded merge (BULK_LOAD_MERGE_PAGES) once at the end.
+                Worth it for large imports, not for a handful of rows
+
+        Returns:
+            List of entity IDs, in input order
+        """
+        now = datetime.now().isoformat()
+        ids = []
+        entity_rows = []
+        fts_rows = []
+
+        for entity in entities:
+            entity_id = entity.get('id', str(uuid.uuid4()))
+            ids.append(entity_id)
+            entity_rows.append((
+                entity_id,
+                entity['type'],
+                entity.get('path'),
+                entity.get('name'),
+                _json_dumps(entity.get('metadata', {})),
                 entity.get('embedding'),
                 now,
                 now,
                 now
             ))
+            fts_rows.append((
+                entity_id,
+                entity['type'],
+                entity.get('name', ''),
+                self._extract_searchable_content(entity)
+            ))
 
-            # Update FTS index
-            content = self._extract_searchable_content(entity)
-            conn.execute("""
-                INSERT INTO entities_fts (id, type, name, content)
-                VALUES (?, ?, ?, ?)
-            """, (entity_id, entity['type'], entity.get('name', ''), content))
+        with self._get_conn() as conn:
+            if defer_fts:
+                row = conn.execute(
+                    "SELECT v FROM entities_fts_config WHERE k = 'automerge'"
+                ).fetchone()
+                automerge = row[0] if row else 4  # FTS5 default
+                conn.execute("INSERT INTO entities_fts(entities_fts, rank) VALUES('automerge', 0)")
+
+            conn.executemany(_INSERT_ENTITY_SQL, entity_rows)
+            conn.executemany(_INSERT_FTS_SQL, fts_rows)
+
+            if defer_fts:
+                # Merge some of the load's segments without rewriting the
+                # whole index, then put the previous automerge setting back
+                conn.execute(
+                    "INSERT INTO entities_fts(entities_fts, rank) VALUES('merge', ?)",
+                    (self.BULK_LOAD_MERGE_PAGES,)
+                )
+                conn.execute(
+                    "INSERT INTO entities_fts(entities_fts, rank) VALUES('automerge', ?)",
+                    (automerge,)
+                )
 
-        return entity_id
+        return ids
 
     def get_entity(self, entity_id: str) -> Optional[Dict[str, Any]]:
         """Get entity by ID.
 
+        A pending touch() is reflected in last_seen even before it is flushed.
+
         Args:
             entity_id: Entity UUID
 
@@ -236,12 +633,14 @@ class KnowledgeGraph:
         """
         with self._get_conn() as conn:
             row = conn.execute(
-                "SELECT * FROM entities WHERE id = ?",
+                f"SELECT {_ENTITY_COLUMNS} FROM entities WHERE id = ?",
                 (entity_id,)
             ).fetchone()
 
             if row:
-                return self._row_to_dict(row)
+                entity = self._row_to_dict(row)
+                self._apply_pending(entity, 'last_seen', self._pending_last_seen)
+                return entity
             return None
 
     def update_entity(self, entity_id: str, updates: Dict[str, Any]):
@@ -254,13 +653,16 @@ class KnowledgeGraph:
         updates['updated_at'] = datetime.now().isoformat()
 
         # Build dynamic UPDATE query
-        set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
+        set_clause = ', '.join(
+            f"{k} = {_JSON_PARAM}" if k == 'metadata' else f"{k} = ?"
+            for k in updates.keys()
+        )
         values = list(updates.values()) + [entity_id]
 
         # Special handling for metadata (needs JSON serialization)
         if 'metadata' in updates:
             idx = list(updates.keys()).index('metadata')
-            values[idx] = json.dumps(values[idx])
+            values[idx] = _json_dumps(values[idx])
 
         with self._get_conn() as conn:
             conn.execute(
@@ -288,10 +690,70 @@ class KnowledgeGraph:
             conn.execute("DELETE FROM entities WHERE id = ?", (entity_id,))
             conn.execute("DELETE FROM entities_fts WHERE id = ?", (entity_id,))
 
+    def delete_entities_where(self,
+                              type: str = None,
+                              path_like: str = None,
+                              name_like: str = None,
+                              language: str = None,
+                              limit: int = None) -> int:
+        """Delete every entity matching the filters in one transaction.
+
+        Cascades to relationships, facts and snapshots like delete_entity,
+        but with one DELETE statement instead of one per entity.
+
+        Args:
+            type: Filter by entity type
+            path_like: SQL LIKE pattern for path
+            name_like: SQL LIKE pattern for name
+            language: Filter by metadata language
+            limit: Maximum number of entities to delete
+
+        Returns:
+            Number of entities deleted
+        """
+        conditions = []
+        params = []
+
+        if type:
+            conditions.append("type = ?")
+            params.append(type)
+
+        if path_like:
+            conditions.append("path LIKE ?")
+            params.append(path_like)
+
+        if name_like:
+            conditions.append("name LIKE ?")
+            params.append(name_like)
+
+        if language:
+            conditions.append("language = ?")
+            params.append(language)
+
+        if not conditions:
+            raise ValueError("delete_entities_where requires at least one filter")
+
+        params.append(limit or -1)
+
+        # Ordered so the FTS and entity deletes select the same rows under LIMIT
+        selection = f"""
+            SELECT id FROM entities
+            WHERE {" AND ".join(conditions)}
+            ORDER BY rowid
+            LIMIT ?
+        """
+
+        with self._get_conn() as conn:
+            conn.execute(f"DELETE FROM entities_fts WHERE id IN ({selection})", params)
+            cursor = conn.execute(f"DELETE FROM entities WHERE id IN ({selection})", params)
+
+            return cursor.rowcount
+
     def query_entities(self,
                       type: str = None,
                       path_like: str = None,
                       name_like: str = None,
+                      language: str = None,
                       last_seen_since: datetime = None,
                       last_seen_hours: int = None,
                       limit: int = None,
@@ -302,6 +764,7 @@ class KnowledgeGraph:
             type: Filter by entity type
             path_like: SQL LIKE pattern for path
             name_like: SQL LIKE pattern for name
+            language: Filter by metadata language (indexed)
             last_seen_since: Only entities seen after this datetime
             last_seen_hours: Only entities seen in last N hours
             limit: Maximum results
@@ -310,6 +773,8 @@ class KnowledgeGraph:
         Returns:
             List of entity dictionaries
         """
+        self._flush_pending_activity()
+
         conditions = []
         params = []
 
@@ -325,6 +790,10 @@ class KnowledgeGraph:
             conditions.append("name LIKE ?")
             params.append(name_like)
 
+        if language:
+            conditions.append("language = ?")
+            params.append(language)
+
         if last_seen_since:
             conditions.append("last_seen >= ?")
             params.append(last_seen_since.isoformat())
@@ -334,20 +803,20 @@ class KnowledgeGraph:
             conditions.append("last_seen >= ?")
             params.append(cutoff)
 
+        # LIMIT/OFFSET are bound, so each filter combination maps to a
+        # single statement text in the connection's statement cache
         where_clause = " AND ".join(conditions) if conditions else "1=1"
-        limit_clause = f"LIMIT {limit}" if limit else ""
-        offset_clause = f"OFFSET {offset}" if offset else ""
+        params.extend([limit or -1, offset or 0])
 
         query = f"""
-            SELECT * FROM entities
+            SELECT {_ENTITY_COLUMNS} FROM entities
             WHERE {where_clause}
             ORDER BY last_seen DESC
-            {limit_clause} {offset_clause}
+            LIMIT ? OFFSET ?
         """
 
         with self._get_conn() as conn:
-            rows = conn.execute(query, params).fetchall()
-            return [self._row_to_dict(row) for row in rows]
+            return self._fetch_dicts(conn, query, params)
 
     def search(self, query: str, types: List[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
         """Full-text search across entities.
@@ -360,21 +829,20 @@ class KnowledgeGraph:
         Returns:
             List of matching entities, ranked by relevance
         """
-        type_filter = ""
-        if types:
-            type_list = "', '".join(types)
-            type_filter = f"AND entities.type IN ('{type_list}')"
+        terms = query.split()
+        if not terms:
+            return []
+
+        # Quote each term so punctuation (hyphens in names and UUIDs, colons,
+        # stray quotes) is matched literally instead of parsed as FTS5 syntax
+        fts_query = " AND ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+        types = types or []
 
         with self._get_conn() as conn:
-            rows = conn.execute(f"""
-                SELECT entities.*
-                FROM entities
-                JOIN entities_fts ON entities.id = entities_fts.id
-                WHERE entities_fts MATCH ?
-                {type_filter}
-                ORDER BY entities_fts.rank
-                LIMIT ?
-            """, (query, limit)).fetchall()
+            rows = conn.execute(
+                _search_sql(len(types)), (fts_query, *types, limit)
+            ).fetchall()
 
             return [self._row_to_dict(row) for row in rows]
 
@@ -400,10 +868,34 @@ class KnowledgeGraph:
                 INSERT INTO relationships (source_id, target_id, rel_type, metadata, created_at)
                 VALUES (?, ?, ?, ?, ?)
             """, (source_id, target_id, rel_type,
-                  json.dumps(metadata or {}), datetime.now().isoformat()))
+                  _json_dumps(metadata or {}), datetime.now().isoformat()))
 
             return cursor.lastrowid
 
+    def add_relationships_bulk(self, rows: List[Tuple]) -> int:
+        """Add many relationships in a single transaction.
+
+        Args:
+            rows: Tuples of (source_id, target_id, rel_type[, metadata])
+
+        Returns:
+            Number of relationships added
+        """
+        now = datetime.now().isoformat()
+        params = [
+            (row[0], row[1], row[2],
+             _json_dumps((row[3] if len(row) > 3 else None) or {}), now)
+            for row in rows
+        ]
+
+        with self._get_conn() as conn:
+            conn.executemany("""
+                INSERT INTO relationships (source_id, target_id, rel_type, metadata, created_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, params)
+
+        return len(params)
+
     def get_relationships(self, entity_id: str, rel_type: str = None,
                          direction: str = 'both') -> List[Dict[str, Any]]:
         """Get relationships for an entity.
@@ -416,30 +908,21 @@ class KnowledgeGraph:
         Returns:
             List of relationship dictionaries
         """
-        conditions = []
-        params = []
-
-        if direction in ['outgoing', 'both']:
-            conditions.append("source_id = ?")
-            params.append(entity_id)
-
-        if direction in ['incoming', 'both'] and direction != 'outgoing':
-            conditions.append("target_id = ?")
-            params.append(entity_id)
-
-        if rel_type:
-            conditions.append("rel_type = ?")
-            params.append(rel_type)
-
-        where_clause = " OR ".join(conditions) if direction == 'both' and len(conditions) > 1 else " AND ".join(conditions)
+        type_filter = " AND rel_type = :rel_type" if rel_type else ""
+        outgoing = f"SELECT * FROM relationships WHERE source_id = :id{type_filter}"
+        incoming = f"SELECT * FROM relationships WHERE target_id = :id{type_filter}"
+
+        if direction == 'outgoing':
+            query = outgoing
+        elif direction == 'incoming':
+            query = incoming
+        else:
+            # Each branch is planned on its own (column, rel_type) index;
+            # self-loops are already returned by the outgoing branch.
+            query = f"{outgoing} UNION ALL {incoming} AND source_id != :id"
 
         with self._get_conn() as conn:
-            rows = conn.execute(f"""
-                SELECT * FROM relationships
-                WHERE {where_clause}
-            """, params).fetchall()
-
-            return [self._row_to_dict(row) for row in rows]
+            return self._fetch_dicts(conn, query, {'id': entity_id, 'rel_type': rel_type})
 
     def delete_relationship(self, rel_id: int):
         """Delete a relationship.
@@ -475,9 +958,9 @@ class KnowledgeGraph:
                 conv.get('thread_id'),
                 conv['started_at'],
                 conv.get('last_message_at', conv['started_at']),
-                json.dumps(conv.get('context', {})),
+                _json_dumps(conv.get('context', {})),
                 conv.get('summary'),
-                json.dumps(conv.get('state', {}))
+                _json_dumps(conv.get('state', {}))
             ))
 
         return conv['id']
@@ -485,6 +968,9 @@ class KnowledgeGraph:
     def get_conversation(self, conv_id: str) -> Optional[Dict[str, Any]]:
         """Get conversation by ID.
 
+        A pending touch_conversation() is reflected in last_message_at even
+        before it is flushed.
+
         Args:
             conv_id: Conversation UUID
 
@@ -498,7 +984,9 @@ class KnowledgeGraph:
             ).fetchone()
 
             if row:
-                return self._row_to_dict(row)
+                conv = self._row_to_dict(row)
+                self._apply_pending(conv, 'last_message_at', self._pending_last_message)
+                return conv
             return None
 
     def update_conversation(self, conv_id: str, updates: Dict[str, Any]):
@@ -510,9 +998,9 @@ class KnowledgeGraph:
         """
         # Serialize JSON fields
         if 'context' in updates:
-            updates['context'] = json.dumps(updates['context'])
+            updates['context'] = _json_dumps(updates['context'])
         if 'state' in updates:
-            updates['state'] = json.dumps(updates['state'])
+            updates['state'] = _json_dumps(updates['state'])
 
         set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
         values = list(updates.values()) + [conv_id]
@@ -536,6 +1024,8 @@ class KnowledgeGraph:
         Returns:
             List of conversation dictionaries
         """
+        self._flush_pending_activity()
+
         conditions = []
         params = []
 
@@ -605,6 +1095,30 @@ class KnowledgeGraph:
 
             return cursor.lastrowid
 
+    def add_facts_bulk(self, rows: List[Tuple]) -> int:
+        """Add many facts in a single transaction.
+
+        Args:
+            rows: Tuples of (entity_id, fact_type, value, source[, confidence])
+
+        Returns:
+            Number of facts added
+        """
+        now = datetime.now().isoformat()
+        params = [
+            (row[0], row[1], row[2], row[3],
+             row[4] if len(row) > 4 else 1.0, now)
+            for row in rows
+        ]
+
+        with self._get_conn() as conn:
+            conn.executemany("""
+                INSERT INTO facts (entity_id, fact_type, value, source, confidence, discovered_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, params)
+
+        return len(params)
+
     def get_facts(self, entity_id: str, fact_type: str = None) -> List[Dict[str, Any]]:
         """Get facts for an entity.
 
@@ -625,8 +1139,60 @@ class KnowledgeGraph:
         query += " ORDER BY discovered_at DESC"
 
         with self._get_conn() as conn:
-            rows = conn.execute(query, params).fetchall()
-            return [self._row_to_dict(row) for row in rows]
+            return self._fetch_dicts(conn, query, params)
+
+    def has_facts(self, fact_type: str) -> bool:
+        """Check whether any fact of the given type exists.
+
+        Args:
+            fact_type: Fact type to look for
+
+        Returns:
+            True if at least one such fact is stored
+        """
+        with self._get_conn() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM facts WHERE fact_type = ? LIMIT 1", (fact_type,)
+            ).fetchone()
+            return row is not None
+
+    def find_entities_by_fact(self, fact_type: str, value: str, type: str = None,
+                              exclude_path: str = None) -> List[Dict[str, Any]]:
+        """Find entities that have a fact with the given type and value.
+
+        One indexed lookup, instead of fetching every entity's facts.
+
+        Args:
+            fact_type: Fact type to match (e.g., 'file_hash')
+            value: Fact value to match
+            type: Optional filter by entity type
+            exclude_path: Optional entity path to leave out
+
+        Returns:
+            List of entity dictionaries, most recently seen first
+        """
+        self._flush_pending_activity()
+
+        conditions = ["facts.fact_type = ?", "facts.value = ?"]
+        params = [fact_type, value]
+
+        if type:
+            conditions.append("entities.type = ?")
+            params.append(type)
+
+        if exclude_path is not None:
+            conditions.append("entities.path IS NOT ?")
+            params.append(exclude_path)
+
+        query = f"""
+            SELECT DISTINCT {_ENTITY_COLUMNS} FROM facts
+            JOIN entities ON entities.id = facts.entity_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY entities.last_seen DESC
+        """
+
+        with self._get_conn() as conn:
+            return self._fetch_dicts(conn, query, params)
 
     # =========================================================================
     # Snapshot Operations
@@ -650,7 +1216,7 @@ class KnowledgeGraph:
             cursor = conn.execute("""
                 INSERT INTO snapshots (entity_id, snapshot, trigger, created_at)
                 VALUES (?, ?, ?, ?)
-            """, (entity_id, json.dumps(entity), trigger, datetime.now().isoformat()))
+            """, (entity_id, _json_dumps(entity), trigger, datetime.now().isoformat()))
 
             return cursor.lastrowid
 
@@ -690,7 +1256,7 @@ class KnowledgeGraph:
             conn.execute("""
                 INSERT OR REPLACE INTO machines (id, name, os, last_sync_at, sync_metadata)
                 VALUES (?, ?, ?, ?, ?)
-            """, (machine_id, name, os, datetime.now().isoformat(), json.dumps({})))
+            """, (machine_id, name, os, datetime.now().isoformat(), _json_dumps({})))
 
     def log_sync(self, machine_id: str, direction: str,
                 entities_changed: int = 0, conflicts_resolved: int = 0):
@@ -740,6 +1306,112 @@ class KnowledgeGraph:
                 return datetime.fromisoformat(row[0])
             return None
 
+    # =========================================================================
+    # Activity Timestamps (coalesced)
+    # =========================================================================
+
+    def touch(self, entity_id: str):
+        """Record that an entity was seen, deferring the last_seen write.
+
+        Touches are coalesced in memory and written by flush_last_seen(),
+        which a background timer runs LAST_SEEN_FLUSH_INTERVAL seconds after
+        the first pending touch. It also runs on close() and before queries
+        that filter or sort on last_seen. A process that dies first loses at
+        most that interval's touches.
+
+        Args:
+            entity_id: Entity UUID
+        """
+        with self._pending_lock:
+            self._pending_last_seen[entity_id] = datetime.now()
+        self._schedule_flush()
+
+    def touch_conversation(self, conv_id: str):
+        """Record conversation activity, deferring the last_message_at write.
+
+        Args:
+            conv_id: Conversation UUID
+        """
+        with self._pending_lock:
+            self._pending_last_message[conv_id] = datetime.now()
+        self._schedule_flush()
+
+    def flush_last_seen(self) -> int:
+        """Write pending last_seen / last_message_at timestamps.
+
+        Rows whose stored timestamp is already within LAST_SEEN_THRESHOLD
+        seconds of the pending one are left untouched.
+
+        Returns:
+            Number of rows updated
+        """
+        with self._pending_lock:
+            entities, self._pending_last_seen = self._pending_last_seen, {}
+            convs, self._pending_last_message = self._pending_last_message, {}
+
+        if not entities and not convs:
+            return 0
+
+        threshold = timedelta(seconds=self.LAST_SEEN_THRESHOLD)
+        updated = 0
+
+        with self._get_conn() as conn:
+            if entities:
+                cursor = conn.executemany("""
+                    UPDATE entities SET last_seen = ?
+                    WHERE id = ? AND last_seen < ?
+                """, [(ts.isoformat(), entity_id, (ts - threshold).isoformat())
+                      for entity_id, ts in entities.items()])
+                updated += cursor.rowcount
+
+            if convs:
+                cursor = conn.executemany("""
+                    UPDATE conversations SET last_message_at = ?
+                    WHERE id = ? AND last_message_at < ?
+                """, [(ts.isoformat(), conv_id, (ts - threshold).isoformat())
+                      for conv_id, ts in convs.items()])
+                updated += cursor.rowcount
+
+        return updated
+
+    def _schedule_flush(self):
+        """Arm the background flush timer unless one is already pending."""
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                return
+            timer = threading.Timer(self.LAST_SEEN_FLUSH_INTERVAL, self._timed_flush)
+            timer.daemon = True
+            self._flush_timer = timer
+        timer.start()
+
+    def _timed_flush(self):
+        """Timer callback: flush pending timestamps."""
+        with self._pending_lock:
+            self._flush_timer = None
+        try:
+            self.flush_last_seen()
+        except sqlite3.ProgrammingError:
+            pass  # Connection closed meanwhile; close() already flushed
+
+    def _apply_pending(self, row: Dict[str, Any], field: str, pending: Dict[str, datetime]):
+        """Overlay a pending, not yet flushed timestamp onto a fetched row.
+
+        Args:
+            row: Entity or conversation dictionary, updated in place
+            field: Timestamp column the pending value belongs to
+            pending: _pending_last_seen or _pending_last_message
+        """
+        with self._pending_lock:
+            ts = pending.get(row['id'])
+
+        if ts is not None and ts.isoformat() > (row.get(field) or ''):
+            row[field] = ts.isoformat()
+
+    def _flush_pending_activity(self):
+        """Flush pending timestamps before a query that depends on them."""
+        if self._pending_last_seen or self._pending_last_message:
+            self.flush_last_seen()
+
     # =========================================================================
     # Health & Maintenance
     # =========================================================================
@@ -756,13 +1428,19 @@ class KnowledgeGraph:
 
     def vacuum(self):
         """Optimize database (reclaim space, rebuild indexes)."""
-        with self._get_conn() as conn:
-            conn.execute("VACUUM")
-            conn.execute("ANALYZE")
+        # VACUUM cannot run inside a transaction
+        with self._lock_conn():
+            self.conn.execute("VACUUM")
+            self.conn.execute("ANALYZE")
 
-    def get_stats(self) -> Dict[str, Any]:
+    def get_stats(self, approximate: bool = False) -> Dict[str, Any]:
         """Get database statistics.
 
+        Args:
+            approximate: Read row counts from sqlite_stat1 (populated by
+                ANALYZE/vacuum) instead of counting. Falls back to exact
+                counts for tables that have not been analyzed.
+
         Returns:
             Dictionary with counts and size info
         """
@@ -777,27 +1455,53 @@ class KnowledgeGraph:
             """).fetchall()
             stats['entities_by_type'] = {row['type']: row['count'] for row in rows}
 
-            # Total counts
-            stats['total_entities'] = conn.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
-            stats['total_relationships'] = conn.execute("SELECT COUNT(*) FROM relationships").fetchone()[0]
-            stats['total_conversations'] = conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
-            stats['total_facts'] = conn.execute("SELECT COUNT(*) FROM facts").fetchone()[0]
-            stats['total_snapshots'] = conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+            # Totals, size and recent activity in a single statement
+            row = conn.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM entities) AS total_entities,
+                    (SELECT COUNT(*) FROM relationships) AS total_relationships,
+                    (SELECT COUNT(*) FROM conversations) AS total_conversations,
+                    (SELECT COUNT(*) FROM facts) AS total_facts,
+                    (SELECT COUNT(*) FROM snapshots) AS total_snapshots,
+                    (SELECT page_count * page_size
+                     FROM pragma_page_count(), pragma_page_size()) AS db_size_bytes,
+                    (SELECT MAX(updated_at) FROM entities) AS last_entity_update,
+                    (SELECT MAX(last_message_at) FROM conversations) AS last_conversation
+            """).fetchone()
+            stats.update(dict(row))
+
+            if approximate:
+                stats.update(self._approximate_counts(conn))
 
-            # Database size
-            stats['db_size_bytes'] = Path(self.db_path).stat().st_size
             stats['db_size_mb'] = round(stats['db_size_bytes'] / (1024 * 1024), 2)
 
-            # Recent activity
-            stats['last_entity_update'] = conn.execute(
-                "SELECT MAX(updated_at) FROM entities"
-            ).fetchone()[0]
+            return stats
 
-            stats['last_conversation'] = conn.execute(
-                "SELECT MAX(last_message_at) FROM conversations"
-            ).fetchone()[0]
+    def _approximate_counts(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """Read table row counts from sqlite_stat1.
 
-            return stats
+        Args:
+            conn: Open database connection
+
+        Returns:
+            Dictionary of total_* counts for tables present in sqlite_stat1
+        """
+        has_stat = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if not has_stat:
+            return {}
+
+        # Partial indexes report fewer rows, so take the largest count per table
+        counts = {}
+        for tbl, stat in conn.execute("""
+            SELECT tbl, stat FROM sqlite_stat1
+            WHERE tbl IN ('entities', 'relationships', 'conversations', 'facts', 'snapshots')
+        """):
+            key = f"total_{tbl}"
+            counts[key] = max(counts.get(key, 0), int(stat.split()[0]))
+
+        return counts
 
     def find_broken_relationships(self) -> List[Dict[str, Any]]:
         """Find relationships pointing to non-existent entities.
@@ -824,6 +1528,8 @@ class KnowledgeGraph:
         Returns:
             Number of entities pruned
         """
+        self._flush_pending_activity()
+
         cutoff = (datetime.now() - timedelta(days=days)).isoformat()
 
         with self._get_conn() as conn:
@@ -861,19 +1567,44 @@ class KnowledgeGraph:
         d = dict(row)
 
         # Parse JSON fields
-        if 'metadata' in d and d['metadata']:
-            d['metadata'] = json.loads(d['metadata'])
-        if 'context' in d and d['context']:
-            d['context'] = json.loads(d['context'])
-        if 'state' in d and d['state']:
-            d['state'] = json.loads(d['state'])
-        if 'snapshot' in d and d['snapshot']:
-            d['snapshot'] = json.loads(d['snapshot'])
-        if 'sync_metadata' in d and d['sync_metadata']:
-            d['sync_metadata'] = json.loads(d['sync_metadata'])
+        for field in _JSON_FIELDS:
+            if d.get(field):
+                d[field] = _json_loads(d[field])
 
         return d
 
+    def _fetch_dicts(self, conn: sqlite3.Connection, query: str, params) -> List[Dict[str, Any]]:
+        """Run a query and build result dictionaries from plain tuples.
+
+        Used by the list queries that can return many rows: the cursor skips
+        the sqlite3.Row wrapper and JSON columns are located once per query
+        rather than looked up by name on every row.
+
+        Args:
+            conn: Open database connection
+            query: SQL query
+            params: Query parameters
+
+        Returns:
+            List of row dictionaries with JSON fields parsed
+        """
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(query, params)
+
+        columns = [col[0] for col in cursor.description]
+        json_columns = [(i, name) for i, name in enumerate(columns) if name in _JSON_FIELDS]
+
+        results = []
+        for row in cursor:
+            d = dict(zip(columns, row))
+            for i, name in json_columns:
+                if row[i]:
+                    d[name] = _json_loads(row[i])
+            results.append(d)
+
+        return results
+
     def _extract_searchable_content(self, entity: Dict[str, Any]) -> str:
         """Extract searchable content from entity for FTS.
 
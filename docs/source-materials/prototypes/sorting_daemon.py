@@ -9,8 +9,12 @@ integration.
 Critical for keeping system organized without manual intervention.
 """
 
+import copy
+import errno
+import fnmatch
 import hashlib
 import json
+import mmap
 import os
 import re
 import shutil
@@ -18,18 +22,147 @@ import sys
 import time
 import zipfile
 import tarfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Pattern, Tuple
 import uuid
 
 import yaml
 
+try:
+    import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+try:
+    # libyaml-backed loader; much faster than the pure-Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 # Import knowledge graph
 sys.path.insert(0, str(Path(__file__).parent))
 from knowledge_graph import KnowledgeGraph
 
 
+# Rule priority -> sort position; unknown priorities sort as medium
+_PRIORITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+# File types _classify_file_ml reads for keyword classification
+_ML_EXTENSIONS = frozenset({'.pdf', '.txt', '.md', '.doc', '.docx'})
+
+
+def _expand_braces(pattern: str) -> List[str]:
+    """Expand every {a,b,c} group in a glob pattern into separate patterns.
+
+    Args:
+        pattern: Glob pattern, e.g. "*.{py,js}"
+
+    Returns:
+        Brace-free patterns, e.g. ["*.py", "*.js"]
+    """
+    match = re.search(r'\{([^}]+)\}', pattern)
+    if not match:
+        return [pattern]
+
+    expanded = []
+    for option in match.group(1).split(','):
+        expanded.extend(_expand_braces(pattern[:match.start()] + option + pattern[match.end():]))
+    return expanded
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> Pattern[str]:
+    """Compile a glob pattern to a single case-insensitive regex.
+
+    Brace groups are expanded into alternatives of one regex, so each
+    rule pattern is translated once rather than on every file.
+
+    Args:
+        pattern: Glob pattern (supports *, ?, {a,b,c})
+
+    Returns:
+        Compiled regex matching file names
+    """
+    return re.compile(
+        '|'.join(fnmatch.translate(alt) for alt in _expand_braces(pattern)),
+        re.IGNORECASE
+    )
+
+
+@lru_cache(maxsize=32)
+def _compile_union(patterns: Tuple[str, ...]) -> Pattern[str]:
+    """Compile several glob patterns into one regex matching any of them.
+
+    Used to rule out files that no rule could match with a single regex
+    match, before trying rules one by one.
+
+    Args:
+        patterns: Glob patterns (supports *, ?, {a,b,c})
+
+    Returns:
+        Compiled regex matching file names; matches nothing if no patterns
+    """
+    if not patterns:
+        return re.compile(r'(?!)')
+
+    return re.compile(
+        '|'.join(_compile_pattern(pattern).pattern for pattern in patterns),
+        re.IGNORECASE
+    )
+
+
+# Files at least this large are hashed through mmap rather than read()
+_MMAP_HASH_MIN_SIZE = 64 * 1024
+
+
+# New file entities written to the KG per bulk_load during a scan
+_KG_LOG_BATCH_SIZE = 50
+
+
+# Seconds a mount check result is reused for
+_MOUNT_CHECK_TTL = 5
+
+
+@lru_cache(maxsize=32)
+def _external_mounted(path: str, ttl_bucket: int) -> bool:
+    """Check whether an external drive path exists, cached per TTL bucket.
+
+    Checking an unmounted automount point can block, so a scan checks each
+    path at most once per _MOUNT_CHECK_TTL seconds.
+
+    Args:
+        path: Mount point to check
+        ttl_bucket: int(time.time() // _MOUNT_CHECK_TTL); a new bucket rechecks
+
+    Returns:
+        True if the path exists
+    """
+    return os.path.exists(path)
+
+
+@lru_cache(maxsize=8)
+def _parse_rules_file(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a sorting rules file, cached on its path, mtime and size.
+
+    Callers must copy the result before mutating it; it is shared
+    between every daemon that loads the same unchanged file.
+
+    Args:
+        path: Path to sorting-rules.yaml
+        mtime_ns: File modification time, so edits invalidate the cache
+        size: File size in bytes
+
+    Returns:
+        Parsed rules dict
+    """
+    with open(path) as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 class SortingDaemon:
     """Automated file organization daemon."""
 
@@ -48,46 +181,110 @@ class SortingDaemon:
         self.rules = self._load_rules()
         self.settings = self.rules.get('settings', {})
         self.ml_classifiers = self.rules.get('ml_classifiers', {})
+        self._check_hash_algo()
+
+        # File hash cache for duplicate detection: path -> (mtime_ns, size, hash)
+        self.hash_cache: Dict[str, Tuple[int, int, str]] = {}
+
+        # New file entities logged during a scan, written in one bulk_load
+        # at its end; None outside scan_directory
+        self._pending_file_entities: Optional[List[Dict[str, Any]]] = None
 
-        # File hash cache for duplicate detection
-        self.hash_cache: Dict[str, str] = {}
+        # Move target directories already created by this daemon
+        self._created_dirs: set = set()
 
     def _load_rules(self) -> Dict[str, Any]:
         """Load sorting rules from YAML file."""
-        if not self.config_path.exists():
-            raise FileNotFoundError(f"Rules file not found: {self.config_path}")
+        try:
+            file_stat = self.config_path.stat()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Rules file not found: {self.config_path}") from None
+
+        # Remembered so reload_rules() can tell whether the file changed
+        self._rules_stamp = (file_stat.st_mtime_ns, file_stat.st_size)
+        rules = _parse_rules_file(str(self.config_path), *self._rules_stamp)
+        return copy.deepcopy(rules)
+
+    def reload_rules(self) -> bool:
+        """Reload sorting rules if the rules file changed since last load.
+
+        Costs one stat() when the file is unchanged. If the file has gone
+        missing, the current rules are kept.
+
+        Returns:
+            True if rules were reloaded
+        """
+        try:
+            file_stat = self.config_path.stat()
+        except FileNotFoundError:
+            return False
 
-        with open(self.config_path) as f:
-            return yaml.safe_load(f)
+        if (file_stat.st_mtime_ns, file_stat.st_size) == self._rules_stamp:
+            return False
+
+        old_algo = self.settings.get('hash_algo', 'sha256')
+        self.rules = self._load_rules()
+        self.settings = self.rules.get('settings', {})
+        self.ml_classifiers = self.rules.get('ml_classifiers', {})
+        self._check_hash_algo()
+
+        # Cached digests from another algorithm would never match new ones
+        if self.settings.get('hash_algo', 'sha256') != old_algo:
+            self.hash_cache.clear()
+        return True
+
+    def _check_hash_algo(self):
+        """Validate settings.hash_algo.
+
+        Raises:
+            ValueError: If the algorithm is unknown, or is blake3 without
+                the blake3 package installed
+        """
+        algo = self.settings.get('hash_algo', 'sha256')
+        if algo == 'blake3':
+            if not HAS_BLAKE3:
+                raise ValueError("hash_algo 'blake3' requires the blake3 package")
+        elif algo not in hashlib.algorithms_available:
+            raise ValueError(f"Unknown hash_algo: {algo}")
 
     def _expand_path(self, path: str) -> Path:
         """Expand ~ and environment variables in path."""
         expanded = os.path.expanduser(os.path.expandvars(path))
         return Path(expanded)
 
-    def _expand_template(self, template: str, file_path: Path) -> str:
+    def _expand_template(self, template: str, file_path: Path, now: datetime = None) -> str:
         """Expand template variables.
 
         Args:
             template: Template string with {{ variables }}
             file_path: File to extract metadata from
+            now: Timestamp for date variables; scan_directory passes one
+                per scan (default: current time)
 
         Returns:
             Expanded string
         """
-        now = datetime.now()
-        file_stat = file_path.stat() if file_path.exists() else None
+        if '{{' not in template:
+            return template
+
+        now = now or datetime.now()
 
         replacements = {
             '{{ year }}': str(now.year),
-            '{{ month }}': now.strftime('%m'),
-            '{{ day }}': now.strftime('%d'),
-            '{{ date }}': now.strftime('%Y-%m-%d'),
+            '{{ month }}': f'{now.month:02d}',
+            '{{ day }}': f'{now.day:02d}',
+            '{{ date }}': f'{now.year:04d}-{now.month:02d}-{now.day:02d}',
             '{{ filename }}': file_path.name,
             '{{ extension }}': file_path.suffix,
-            '{{ size_mb }}': str(round(file_stat.st_size / (1024 * 1024), 2)) if file_stat else '0'
         }
 
+        # Only stat the file when the template actually asks for its size
+        if '{{ size_mb }}' in template:
+            file_stat = file_path.stat() if file_path.exists() else None
+            replacements['{{ size_mb }}'] = (
+                str(round(file_stat.st_size / (1024 * 1024), 2)) if file_stat else '0'
+            )
+
         result = template
         for var, value in replacements.items():
             result = result.replace(var, value)
@@ -102,25 +299,9 @@ class SortingDaemon:
             pattern: Glob pattern (supports *, ?, {a,b,c})
 
         Returns:
-            True if matches
+            True if matches (case-insensitive)
         """
-        import fnmatch
-
-        # Handle {a,b,c} brace expansion
-        if '{' in pattern and '}' in pattern:
-            # Extract brace content
-            match = re.search(r'\{([^}]+)\}', pattern)
-            if match:
-                options = match.group(1).split(',')
-                base_pattern = pattern[:match.start()] + '{}' + pattern[match.end():]
-
-                for option in options:
-                    expanded = base_pattern.replace('{}', option)
-                    if fnmatch.fnmatch(file_path.name, expanded):
-                        return True
-                return False
-
-        return fnmatch.fnmatch(file_path.name, pattern)
+        return _compile_pattern(pattern).match(file_path.name) is not None
 
     def _classify_file_ml(self, file_path: Path) -> Dict[str, float]:
         """Classify file using ML (keyword-based for now).
@@ -134,12 +315,17 @@ class SortingDaemon:
         results = {}
 
         # Only try to read text-based files
-        if file_path.suffix.lower() not in ['.pdf', '.txt', '.md', '.doc', '.docx']:
+        suffix = file_path.suffix.lower()
+        if suffix not in _ML_EXTENSIONS:
+            return results
+
+        # Nothing to score against, so don't read the file
+        if not any('keywords' in config for config in self.ml_classifiers.values()):
             return results
 
         try:
             # For PDF, try to extract text (simplified - just read raw)
-            if file_path.suffix.lower() == '.pdf':
+            if suffix == '.pdf':
                 # Read first 10KB of PDF as text (crude but works for keywords)
                 with open(file_path, 'rb') as f:
                     content = f.read(10240).decode('utf-8', errors='ignore').lower()
@@ -156,12 +342,19 @@ class SortingDaemon:
                 keywords = config['keywords']
                 threshold = config.get('confidence_threshold', 0.5)
 
-                # Count keyword matches
-                matches = sum(1 for kw in keywords if kw.lower() in content)
-                confidence = matches / len(keywords)
-
-                if confidence >= threshold:
-                    results[category] = confidence
+                # Count keyword matches, giving up once enough have missed
+                # that even matching the rest couldn't reach the threshold
+                total = len(keywords)
+                misses = 0
+                for kw in keywords:
+                    if kw.lower() not in content:
+                        misses += 1
+                        if (total - misses) / total < threshold:
+                            break
+                else:
+                    confidence = (total - misses) / total
+                    if confidence >= threshold:
+                        results[category] = confidence
 
         except (OSError, UnicodeDecodeError):
             pass
@@ -178,23 +371,32 @@ class SortingDaemon:
             True if contains code
         """
         try:
-            code_extensions = self.ml_classifiers.get('contains_code', {}).get('file_extensions', [])
+            code_extensions = tuple(
+                self.ml_classifiers.get('contains_code', {}).get('file_extensions', [])
+            )
             min_files = self.ml_classifiers.get('contains_code', {}).get('min_code_files', 3)
 
+            # Nothing can count as code, so don't open the archive at all
+            if not code_extensions:
+                return False
+
             code_file_count = 0
 
             if file_path.suffix == '.zip':
+                # namelist() only reads the central directory; nothing is decompressed
                 with zipfile.ZipFile(file_path, 'r') as archive:
                     for name in archive.namelist():
-                        if any(name.endswith(ext) for ext in code_extensions):
+                        if name.endswith(code_extensions):
                             code_file_count += 1
                             if code_file_count >= min_files:
                                 return True
 
             elif file_path.suffix in ['.tar', '.gz', '.tgz']:
+                # Iterate lazily so the stream stops at min_files instead of
+                # reading (and decompressing) the whole archive up front
                 with tarfile.open(file_path, 'r:*') as archive:
-                    for member in archive.getmembers():
-                        if any(member.name.endswith(ext) for ext in code_extensions):
+                    for member in archive:
+                        if member.name.endswith(code_extensions):
                             code_file_count += 1
                             if code_file_count >= min_files:
                                 return True
@@ -205,7 +407,14 @@ class SortingDaemon:
         return False
 
     def _compute_file_hash(self, file_path: Path) -> str:
-        """Compute SHA256 hash of file.
+        """Compute content hash of file (SHA256 unless settings.hash_algo says otherwise).
+
+        Hashes are only compared for duplicate detection, so a faster
+        non-cryptographic-grade algorithm such as blake3 or blake2b can be
+        configured. Changing it makes existing file_hash facts unmatchable.
+
+        Hashes are cached per path and reused while the file's mtime and
+        size are unchanged, so repeat lookups cost one stat().
 
         Args:
             file_path: File to hash
@@ -213,19 +422,36 @@ class SortingDaemon:
         Returns:
             Hex digest of hash
         """
-        if str(file_path) in self.hash_cache:
-            return self.hash_cache[str(file_path)]
+        key = str(file_path)
+        try:
+            file_stat = os.stat(key)
+        except OSError:
+            return ""
 
-        sha256 = hashlib.sha256()
+        cached = self.hash_cache.get(key)
+        if cached is not None and cached[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+            return cached[2]
 
+        algo = self.settings.get('hash_algo', 'sha256')
         try:
             with open(file_path, 'rb') as f:
-                # Read in chunks for large files
-                for chunk in iter(lambda: f.read(8192), b''):
-                    sha256.update(chunk)
-
-            hash_value = sha256.hexdigest()
-            self.hash_cache[str(file_path)] = hash_value
+                if file_stat.st_size < _MMAP_HASH_MIN_SIZE:
+                    # Small files: one read() is cheaper than setting up a
+                    # mapping (and mmap can't map an empty file)
+                    data = f.read()
+                    hasher = blake3.blake3(data) if algo == 'blake3' else hashlib.new(algo, data)
+                elif algo == 'blake3':
+                    # Maps the file and hashes it with multiple threads
+                    hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+                    hasher.update_mmap(key)
+                else:
+                    # Large files: hash the mapped pages in one update call,
+                    # without copying them into a read buffer first
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        hasher = hashlib.new(algo, mapped)
+                hash_value = hasher.hexdigest()
+
+            self.hash_cache[key] = (file_stat.st_mtime_ns, file_stat.st_size, hash_value)
             return hash_value
 
         except OSError:
@@ -240,37 +466,35 @@ class SortingDaemon:
         Returns:
             (is_duplicate, original_path)
         """
+        # Nothing to compare against: skip reading and hashing the file
+        if not self.kg.has_facts('file_hash'):
+            return (False, None)
+
         file_hash = self._compute_file_hash(file_path)
         if not file_hash:
             return (False, None)
 
-        # Query knowledge graph for files with same hash
-        facts = self.kg.query_entities(type='file')
-
-        for entity in facts:
-            entity_facts = self.kg.get_facts(entity['id'], fact_type='file_hash')
-            for fact in entity_facts:
-                if fact['value'] == file_hash and entity['path'] != str(file_path):
-                    return (True, entity['path'])
+        # One indexed lookup for other files with the same hash
+        matches = self.kg.find_entities_by_fact(
+            'file_hash', file_hash, type='file', exclude_path=str(file_path)
+        )
+        if matches:
+            return (True, matches[0]['path'])
 
         return (False, None)
 
-    def _check_conditions(self, file_path: Path, conditions: Dict[str, Any]) -> bool:
+    def _check_conditions(self, file_path: Path, conditions: Dict[str, Any],
+                          file_stat: os.stat_result = None) -> bool:
         """Check if file meets rule conditions.
 
         Args:
             file_path: File to check
             conditions: Condition dictionary from rule
+            file_stat: Stat result already fetched by the caller, if any
 
         Returns:
             True if all conditions met
         """
-        # ML category check
-        if 'ml_category' in conditions:
-            classifications = self._classify_file_ml(file_path)
-            if conditions['ml_category'] not in classifications:
-                return False
-
         # Size check
         if 'size_gt' in conditions:
             size_str = conditions['size_gt']
@@ -279,15 +503,22 @@ class SortingDaemon:
             for unit, mult in multiplier.items():
                 if unit in size_str.upper():
                     threshold = float(size_str.upper().replace(unit, '')) * mult
-                    if file_path.stat().st_size <= threshold:
+                    file_stat = file_stat or file_path.stat()
+                    if file_stat.st_size <= threshold:
                         return False
                     break
 
-        # Age check
+        # Age check (whole days, as timedelta.days counted them)
         if 'age_days' in conditions:
             age_days = conditions['age_days']
-            file_age = datetime.now() - datetime.fromtimestamp(file_path.stat().st_mtime)
-            if file_age.days < age_days:
+            file_stat = file_stat or file_path.stat()
+            if (time.time() - file_stat.st_mtime) // 86400 < age_days:
+                return False
+
+        # ML category check; reads the file, so it runs after the stat checks
+        if 'ml_category' in conditions:
+            classifications = self._classify_file_ml(file_path)
+            if conditions['ml_category'] not in classifications:
                 return False
 
         # Contains code check
@@ -303,19 +534,21 @@ class SortingDaemon:
 
         # External drive mounted check
         if 'external_mounted' in conditions and conditions['external_mounted']:
-            external_path = Path('/Volumes/4444-iivii')
-            if not external_path.exists():
+            ttl_bucket = int(time.time() // _MOUNT_CHECK_TTL)
+            if not _external_mounted('/Volumes/4444-iivii', ttl_bucket):
                 return False
 
         return True
 
-    def _execute_action(self, file_path: Path, action: Dict[str, Any], dry_run: bool = False) -> bool:
+    def _execute_action(self, file_path: Path, action: Dict[str, Any], dry_run: bool = False,
+                        now: datetime = None) -> bool:
         """Execute file action.
 
         Args:
             file_path: File to act on
             action: Action dictionary from rule
             dry_run: If True, only print what would be done
+            now: Timestamp for template date variables (default: current time)
 
         Returns:
             True if action executed successfully
@@ -336,41 +569,57 @@ class SortingDaemon:
 
         # Move action
         if 'move_to' in action:
-            target_dir = self._expand_path(self._expand_template(action['move_to'], file_path))
+            target_dir = self._expand_path(self._expand_template(action['move_to'], file_path, now))
 
             if dry_run:
                 print(f"  [DRY RUN] Would move: {file_path.name} → {target_dir}")
                 return True
 
             try:
-                # Create target directory
-                if self.settings.get('create_dirs', True):
+                # Create target directory (once per directory per daemon)
+                if self.settings.get('create_dirs', True) and target_dir not in self._created_dirs:
                     target_dir.mkdir(parents=True, exist_ok=True)
-
-                target_path = target_dir / file_path.name
-
-                # Handle name conflicts
-                if target_path.exists():
-                    base = target_path.stem
-                    suffix = target_path.suffix
-                    counter = 1
-                    while target_path.exists():
-                        target_path = target_dir / f"{base}_{counter}{suffix}"
-                        counter += 1
-
-                # Move file
-                shutil.move(str(file_path), str(target_path))
-                print(f"  ✅ Moved: {file_path.name} → {target_dir}")
+                    self._created_dirs.add(target_dir)
+
+                # Target kept as a str; a Path is only built for the KG log
+                name = file_path.name
+                target_dir_str = os.fspath(target_dir)
+                target_path = os.path.join(target_dir_str, name)
+
+                # Handle name conflicts (one stat when there is none)
+                counter = 1
+                while os.path.exists(target_path):
+                    stem, dot, suffix = name.rpartition('.')
+                    if not stem:
+                        # No extension (or a dotfile): number the whole name
+                        stem, dot, suffix = name, '', ''
+                    target_path = os.path.join(target_dir_str, f"{stem}_{counter}{dot}{suffix}")
+                    counter += 1
+
+                # Move file: a single rename on the same filesystem,
+                # copy + unlink only across devices
+                try:
+                    os.replace(file_path, target_path)
+                except FileNotFoundError:
+                    if target_dir not in self._created_dirs or not file_path.exists():
+                        raise
+                    # Cached directory was removed since; recreate and retry
+                    target_dir.mkdir(parents=True, exist_ok=True)
+                    os.replace(file_path, target_path)
+                except OSError as e:
+                    if e.errno != errno.EXDEV:
+                        raise
+                    shutil.move(str(file_path), target_path)
+                print(f"  ✅ Moved: {name} → {target_dir}")
 
                 # Create symlink if requested
                 if action.get('create_symlink'):
-                    symlink_path = file_path.parent / file_path.name
-                    symlink_path.symlink_to(target_path)
-                    print(f"    ↳ Created symlink: {symlink_path}")
+                    os.symlink(target_path, file_path)
+                    print(f"    ↳ Created symlink: {file_path}")
 
                 # Log to knowledge graph
                 if self.settings.get('log_all_moves', True):
-                    self._log_file_move(file_path, target_path)
+                    self._log_file_move(file_path, Path(target_path))
 
                 return True
 
@@ -380,18 +629,18 @@ class SortingDaemon:
 
         # Prompt action (interactive)
         if 'prompt' in action:
-            prompt_text = self._expand_template(action['prompt'], file_path)
+            prompt_text = self._expand_template(action['prompt'], file_path, now)
             response = input(f"  ❓ {prompt_text} [y/N]: ")
 
             if response.lower() in ['y', 'yes']:
                 if action.get('on_yes') == 'delete':
-                    return self._execute_action(file_path, {'delete': True}, dry_run)
+                    return self._execute_action(file_path, {'delete': True}, dry_run, now)
                 elif action.get('on_yes', {}).get('move_to'):
-                    return self._execute_action(file_path, {'move_to': action['on_yes']['move_to']}, dry_run)
+                    return self._execute_action(file_path, {'move_to': action['on_yes']['move_to']}, dry_run, now)
             else:
                 if action.get('on_no') == 'move_to_review':
                     review_dir = self._expand_path("~/Downloads/Review")
-                    return self._execute_action(file_path, {'move_to': str(review_dir)}, dry_run)
+                    return self._execute_action(file_path, {'move_to': str(review_dir)}, dry_run, now)
 
         return False
 
@@ -409,10 +658,8 @@ class SortingDaemon:
             if existing:
                 # Update existing entity
                 entity_id = existing[0]['id']
-                self.kg.update_entity(entity_id, {
-                    'path': str(target_path),
-                    'last_seen': datetime.now().isoformat()
-                })
+                self.kg.update_entity(entity_id, {'path': str(target_path)})
+                self.kg.touch(entity_id)
             else:
                 # Create new entity
                 entity = {
@@ -426,11 +673,71 @@ class SortingDaemon:
                         'moved_by': 'sorting_daemon'
                     }
                 }
-                self.kg.insert_entity(entity)
+
+                pending = self._pending_file_entities
+                if pending is None:
+                    self.kg.insert_entity(entity)
+                    return
+
+                # Mid-scan: an entity queued earlier in this scan counts as
+                # existing, just as it would once written
+                name = source_path.name.lower()
+                queued = next((e for e in pending if name in e['path'].lower()), None)
+                if queued:
+                    queued['path'] = str(target_path)
+                else:
+                    pending.append(entity)
 
         except Exception as e:
             print(f"    ⚠️  Failed to log to KG: {e}")
 
+    def _flush_pending_file_entities(self):
+        """Write file entities queued during a scan with one bulk_load."""
+        pending = self._pending_file_entities
+        if not pending:
+            return
+
+        try:
+            self.kg.bulk_load(pending)
+        except Exception as e:
+            print(f"    ⚠️  Failed to log {len(pending)} moves to KG: {e}")
+        pending.clear()
+
+    def _first_matching_rule(self, file_path: Path, file_stat: os.stat_result,
+                             rules: List[Dict[str, Any]], start: int = 0,
+                             patterns: Optional[List[Pattern[str]]] = None) -> int:
+        """Find the first rule whose pattern and conditions match a file.
+
+        Args:
+            file_path: File to check
+            file_stat: Stat result for the file
+            rules: Rules in priority order
+            start: Index of the first rule to try
+            patterns: Compiled pattern for each rule, if already compiled
+
+        Returns:
+            Index into rules, or -1 if none match
+        """
+        if patterns is None:
+            patterns = [_compile_pattern(rule['pattern']) for rule in rules]
+
+        name = file_path.name
+        for index in range(start, len(rules)):
+            rule = rules[index]
+
+            # Check pattern
+            if patterns[index].match(name) is None:
+                continue
+
+            # Check conditions
+            conditions = rule.get('conditions', {})
+            if conditions and not self._check_conditions(file_path, conditions, file_stat):
+                continue
+
+            return index
+
+        return -1
+
     def scan_directory(self, directory: Path = None, dry_run: bool = None) -> Dict[str, int]:
         """Scan directory and apply sorting rules.
 
@@ -461,71 +768,129 @@ class SortingDaemon:
             'errors': 0
         }
 
-        # Get all files in directory
-        if not directory.exists():
+        # scandir reports the file type from the directory listing itself,
+        # and each entry caches its stat() for the checks below. Symlinks
+        # (such as those left by create_symlink) are not sorted again.
+        try:
+            with os.scandir(directory) as it:
+                files = [entry for entry in it if entry.is_file(follow_symlinks=False)]
+        except FileNotFoundError:
             print(f"❌ Directory not found: {directory}")
             return stats
-
-        files = [f for f in directory.iterdir() if f.is_file()]
         stats['scanned'] = len(files)
 
         print(f"Found {len(files)} files")
         print()
 
-        # Process each file
-        for file_path in files:
+        # Constant for the whole scan: one timestamp for ages and templates,
+        # and the rules in priority order
+        scan_time = datetime.now()
+        min_age_hours = self.settings.get('min_file_age_hours', 0)
+        rules_sorted = sorted(
+            self.rules.get('rules', []),
+            key=lambda r: _PRIORITY_ORDER.get(r.get('priority', 'medium'), 1)
+        )
+        # Every file here shares this parent, so rules for other source
+        # directories can be dropped up front
+        scan_dir = Path(directory)
+        rules_here = [
+            rule for rule in rules_sorted
+            if self._expand_path(rule.get('source', '~/Downloads')) == scan_dir
+        ]
+        any_rule = _compile_union(tuple(rule['pattern'] for rule in rules_here))
+        # Compiled once here so matching a file is a plain regex call per rule
+        rule_patterns = [_compile_pattern(rule['pattern']) for rule in rules_here]
+
+        def prepare(entry: os.DirEntry) -> Tuple[Optional[Path], Any, int]:
+            """Find an entry's first matching rule: (path, stat, index).
+
+            Index is -1 when no rule applies; path is None when the name
+            can't match or the file is too new. Exceptions are returned
+            in place of the stat so they count against this file only.
+            """
+            # One regex match on the bare name rules out files no rule's
+            # pattern covers, before any stat() or Path for them
+            if not any_rule.match(entry.name):
+                return None, None, -1
+
+            file_path = Path(entry.path)
             try:
+                file_stat = entry.stat()
+
                 # Check min age
-                min_age_hours = self.settings.get('min_file_age_hours', 0)
                 if min_age_hours > 0:
-                    file_age = datetime.now() - datetime.fromtimestamp(file_path.stat().st_mtime)
+                    file_age = scan_time - datetime.fromtimestamp(file_stat.st_mtime)
                     if file_age.total_seconds() < min_age_hours * 3600:
-                        stats['skipped'] += 1
-                        continue
+                        return None, None, -1
 
-                # Try each rule in priority order
-                rules_sorted = sorted(
-                    self.rules.get('rules', []),
-                    key=lambda r: {'high': 0, 'medium': 1, 'low': 2}.get(r.get('priority', 'medium'), 1)
+                return file_path, file_stat, self._first_matching_rule(
+                    file_path, file_stat, rules_here, patterns=rule_patterns
                 )
+            except Exception as e:
+                return file_path, e, -1
+
+        # Rule checks (stat, hashing, archive and ML reads) only read, so
+        # with scan_workers > 1 they run on a thread pool. Actions still run
+        # one file at a time, in listing order.
+        workers = self.settings.get('scan_workers', 1)
+        pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 and len(files) >= 8 else None
+
+        # New file entities for logged moves are queued and written with
+        # bulk_load in small batches, each its own short transaction, so no
+        # write lock is held across actions (including interactive prompts).
+        # Whatever is queued is written even if the scan is interrupted,
+        # keeping the graph in step with files already moved.
+        self._pending_file_entities = []
+        try:
+            prepared = pool.map(prepare, files) if pool else map(prepare, files)
 
-                matched = False
-
-                for rule in rules_sorted:
-                    # Check pattern
-                    if not self._matches_pattern(file_path, rule['pattern']):
-                        continue
-
-                    # Check source directory
-                    source = self._expand_path(rule.get('source', '~/Downloads'))
-                    if file_path.parent != source:
-                        continue
-
-                    # Check conditions
-                    conditions = rule.get('conditions', {})
-                    if conditions and not self._check_conditions(file_path, conditions):
-                        continue
-
-                    # Execute action
-                    print(f"📋 Rule: {rule['name']}")
-                    print(f"   File: {file_path.name}")
-
-                    action = rule.get('action', {})
-                    if self._execute_action(file_path, action, dry_run):
-                        stats['matched'] += 1
-                        if action.get('delete'):
-                            stats['deleted'] += 1
-                        elif action.get('move_to'):
-                            stats['moved'] += 1
-                        matched = True
-                        break
-
-                if not matched:
+            for file_path, file_stat, index in prepared:
+                if file_path is None:
                     stats['skipped'] += 1
+                    continue
 
-            except Exception as e:
-                print(f"  ❌ Error processing {file_path.name}: {e}")
-                stats['errors'] += 1
+                try:
+                    if isinstance(file_stat, Exception):
+                        raise file_stat
+
+                    # Try matching rules in priority order until an action succeeds
+                    matched = False
+
+                    while index >= 0:
+                        rule = rules_here[index]
+
+                        # Execute action
+                        print(f"📋 Rule: {rule['name']}")
+                        print(f"   File: {file_path.name}")
+
+                        action = rule.get('action', {})
+                        if self._execute_action(file_path, action, dry_run, scan_time):
+                            stats['matched'] += 1
+                            if action.get('delete'):
+                                stats['deleted'] += 1
+                            elif action.get('move_to'):
+                                stats['moved'] += 1
+                            matched = True
+                            break
+
+                        index = self._first_matching_rule(
+                            file_path, file_stat, rules_here, index + 1, rule_patterns
+                        )
+
+                    if not matched:
+                        stats['skipped'] += 1
+
+                    if len(self._pending_file_entities) >= _KG_LOG_BATCH_SIZE:
+                        self._flush_pending_file_entities()
+
+                except Exception as e:
+                    print(f"  ❌ Error processing {file_path.name}: {e}")
+                    stats['errors'] += 1
+        finally:
+            if pool:
+                pool.shutdown()
+            self._flush_pending_file_entities()
+            self._pending_file_entities = None
 
         print()
         print("=" * 60)
@@ -558,6 +923,8 @@ class SortingDaemon:
 
         try:
             while True:
+                if self.reload_rules():
+                    print(f"🔄 Reloaded rules from {self.config_path}")
                 self.scan_directory(directory)
                 print(f"💤 Sleeping for {interval} seconds...")
                 print()
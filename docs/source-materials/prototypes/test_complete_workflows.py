@@ -9,7 +9,6 @@ that the entire system works together in realistic scenarios.
 import pytest
 import tempfile
 from pathlib import Path
-import yaml
 import sys
 import time
 from datetime import datetime, timedelta
@@ -19,6 +18,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from knowledge_graph import KnowledgeGraph
 from context_manager import ConversationManager
 from sorting_daemon import SortingDaemon
+from tests.test_helpers import write_yaml_config
 
 
 # ============================================================================
@@ -79,8 +79,7 @@ class TestCompleteDeveloperSession:
         }
 
         config_path = tmp_path / "sorting.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         daemon = SortingDaemon(str(config_path), str(kg_path))
 
@@ -190,8 +189,7 @@ class TestFileOrganizationJourney:
         }
 
         config_path = tmp_path / "sorting.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         daemon = SortingDaemon(str(config_path), str(kg_path))
 
@@ -366,8 +364,7 @@ class TestMultiComponentWorkflow:
         }
 
         config_path = tmp_path / "sorting.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         daemon = SortingDaemon(str(config_path), str(kg_path))
 
@@ -585,8 +582,7 @@ class TestE2EPerformance:
         }
 
         config_path = tmp_path / "sorting.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         daemon = SortingDaemon(str(config_path), str(kg_path))
 
@@ -13,13 +13,13 @@ import pytest
 import tempfile
 from pathlib import Path
 import sys
-import yaml
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from knowledge_graph import KnowledgeGraph
 from context_manager import ConversationManager
 from sorting_daemon import SortingDaemon
+from tests.test_helpers import write_yaml_config
 
 
 # ============================================================================
@@ -62,8 +62,7 @@ def integrated_system(tmp_path):
     }
 
     config_path = tmp_path / "config.yaml"
-    with open(config_path, 'w') as f:
-        yaml.dump(config, f)
+    write_yaml_config(config_path, config)
 
     daemon = SortingDaemon(str(config_path), str(kg_path))
 
@@ -260,8 +259,7 @@ class TestScalabilityBenchmarks:
         }
 
         config_path = tmp_path / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         daemon = SortingDaemon(str(config_path), str(kg_path))
         kg = KnowledgeGraph(str(kg_path))
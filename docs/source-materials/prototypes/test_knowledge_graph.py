@@ -8,7 +8,10 @@ Coverage target: >90% (critical component)
 import pytest
 import sqlite3
 import json
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -23,6 +26,7 @@ from tests.test_helpers import (
     assert_relationship_valid,
     make_entities,
     count_entities,
+    seed_entities,
 )
 
 
@@ -68,12 +72,15 @@ class TestKnowledgeGraphInit:
 
         conn.close()
 
-    def test_init_with_default_path(self):
+    def test_init_with_default_path(self, tmp_path, monkeypatch):
         """Should use default path when none provided."""
+        # Point HOME at tmp_path so parallel workers never share the real metastore
+        monkeypatch.setenv('HOME', str(tmp_path))
         kg = KnowledgeGraph()
 
-        expected_path = Path.home() / ".metasystem" / "metastore.db"
+        expected_path = tmp_path / ".metasystem" / "metastore.db"
         assert Path(kg.db_path) == expected_path
+        kg.close()
 
     def test_init_creates_parent_directory(self, tmp_path):
         """Should create parent directories if they don't exist."""
@@ -83,6 +90,45 @@ class TestKnowledgeGraphInit:
         assert db_path.parent.exists()
         assert db_path.exists()
 
+    def test_init_reindexes_old_fts_tokenizer(self, tmp_path):
+        """Should rebuild the FTS index when it was created with an older tokenizer."""
+        db_path = tmp_path / "test.db"
+        kg = KnowledgeGraph(str(db_path))
+        entity_id = kg.insert_entity({'type': 'project', 'name': 'résumé-builder'})
+        kg.conn.execute("DROP TABLE entities_fts")
+        kg.conn.execute("""
+            CREATE VIRTUAL TABLE entities_fts USING fts5(
+                id UNINDEXED, type, name, content, tokenize = 'porter unicode61'
+            )
+        """)
+        kg.close()
+
+        kg = KnowledgeGraph(str(db_path))
+
+        assert [r['id'] for r in kg.search('resume')] == [entity_id]
+        kg.close()
+
+    def test_init_enables_wal(self, disk_kg):
+        """File-backed graphs should use WAL with NORMAL sync, mmap and a busy timeout."""
+        conn = disk_kg.conn
+
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+        # 0 where SQLite was built without mmap support
+        assert conn.execute("PRAGMA mmap_size").fetchone()[0] in (0, 268435456)
+
+    def test_init_in_memory(self, tmp_path, monkeypatch):
+        """Should build the schema in memory without touching the filesystem."""
+        monkeypatch.chdir(tmp_path)
+        kg = KnowledgeGraph(":memory:")
+
+        entity_id = kg.insert_entity({'type': 'project', 'name': 'mem'})
+
+        assert kg.get_entity(entity_id)['name'] == 'mem'
+        assert list(tmp_path.iterdir()) == []
+        kg.close()
+
 
 # ============================================================================
 # Entity CRUD Tests
@@ -143,6 +189,7 @@ class TestEntityCRUD:
             'name': 'test-project',
         }
 
+        cutoff = (datetime.now() - timedelta(minutes=1)).isoformat()
         entity_id = tmp_kg.insert_entity(entity)
         retrieved = tmp_kg.get_entity(entity_id)
 
@@ -150,11 +197,37 @@ class TestEntityCRUD:
         assert 'updated_at' in retrieved
         assert 'last_seen' in retrieved
 
-        # Timestamps should be recent (within last minute)
+        # Timestamps should be recent (within last minute); ISO strings
+        # order chronologically, so no parsing is needed
         for ts_field in ['created_at', 'updated_at', 'last_seen']:
-            ts = datetime.fromisoformat(retrieved[ts_field])
-            now = datetime.now()
-            assert (now - ts).total_seconds() < 60
+            assert retrieved[ts_field] >= cutoff
+
+    def test_bulk_load(self, tmp_kg):
+        """Should insert all entities and make them searchable."""
+        entities = make_entities(25)
+
+        ids = tmp_kg.bulk_load(entities)
+
+        assert len(ids) == 25
+        assert count_entities(tmp_kg, 'project') == 25
+        assert tmp_kg.get_entity(ids[3])['name'] == 'test-project-3'
+        assert len(tmp_kg.search('test', limit=100)) == 25
+
+    def test_bulk_load_with_deferred_fts(self, tmp_kg):
+        """Should index entities and keep the automerge setting with defer_fts."""
+        tmp_kg.conn.execute(
+            "INSERT INTO entities_fts(entities_fts, rank) VALUES('automerge', 8)"
+        )
+
+        ids = tmp_kg.bulk_load(make_entities(3, 'tool'), defer_fts=True)
+
+        results = tmp_kg.search('tool')
+        automerge = tmp_kg.conn.execute(
+            "SELECT v FROM entities_fts_config WHERE k = 'automerge'"
+        ).fetchone()[0]
+
+        assert {r['id'] for r in results} == set(ids)
+        assert automerge == 8
 
     def test_get_entity_exists(self, tmp_kg):
         """Should retrieve existing entity."""
@@ -203,10 +276,17 @@ class TestEntityCRUD:
         assert updated['metadata']['version'] == 2
         assert updated['metadata']['updated'] == True
 
+    def test_update_entity_refreshes_search_index(self, tmp_kg):
+        """Should index the updated name, not the pre-update one."""
+        entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'oldname'})
+
+        tmp_kg.update_entity(entity_id, {'name': 'newname'})
+
+        assert [e['id'] for e in tmp_kg.search('newname')] == [entity_id]
+        assert tmp_kg.search('oldname') == []
+
     def test_update_entity_updates_timestamp(self, tmp_kg):
         """Should update updated_at timestamp."""
-        import time
-
         entity = {
             'type': 'project',
             'name': 'test-project',
@@ -276,6 +356,26 @@ class TestEntityCRUD:
         rels = tmp_kg.get_relationships(entity2_id)
         assert len(rels) == 0
 
+    def test_delete_entities_where(self, tmp_kg):
+        """Should delete matching entities, their FTS rows and relationships."""
+        seed_entities(tmp_kg, 6, entity_type='test', name_prefix='entity')
+        keep_id = tmp_kg.insert_entity({'type': 'project', 'name': 'keep'})
+        doomed = tmp_kg.query_entities(type='test')
+        tmp_kg.add_relationship(keep_id, doomed[0]['id'], 'uses')
+
+        deleted = tmp_kg.delete_entities_where(type='test')
+
+        assert deleted == 6
+        assert tmp_kg.query_entities(type='test') == []
+        assert tmp_kg.search('entity') == []
+        assert tmp_kg.get_relationships(keep_id) == []
+        assert tmp_kg.get_entity(keep_id) is not None
+
+    def test_delete_entities_where_requires_filter(self, tmp_kg):
+        """Should refuse to delete the whole table."""
+        with pytest.raises(ValueError):
+            tmp_kg.delete_entities_where()
+
     def test_delete_nonexistent_entity(self, tmp_kg):
         """Should handle deleting nonexistent entity gracefully."""
         # Should not raise error
@@ -308,9 +408,7 @@ class TestEntityQuery:
 
     def test_query_with_limit(self, tmp_kg):
         """Should respect limit parameter."""
-        # Insert multiple entities
-        for i in range(20):
-            tmp_kg.insert_entity({'type': 'project', 'name': f'proj-{i}'})
+        seed_entities(tmp_kg, 20)
 
         results = tmp_kg.query_entities(limit=5)
 
@@ -318,9 +416,6 @@ class TestEntityQuery:
 
     def test_query_recent_entities(self, tmp_kg):
         """Should query entities seen recently."""
-        import time
-        from datetime import datetime, timedelta
-
         # Insert entities at different times
         old_id = tmp_kg.insert_entity({'type': 'project', 'name': 'old'})
 
@@ -338,6 +433,27 @@ class TestEntityQuery:
         assert len(recent) == 1  # Only 'new' should be recent
         assert recent[0]['id'] == new_id
 
+    def test_query_by_type_uses_composite_index(self, populated_kg):
+        """Type + recency filter should be an index range scan, not a table scan."""
+        plan = populated_kg.conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT * FROM entities WHERE type = ? AND last_seen >= ?
+            ORDER BY last_seen DESC
+        """, ('project', '2000-01-01')).fetchall()
+        details = ' '.join(row[3] for row in plan)
+
+        assert 'idx_entities_type_last_seen' in details
+        assert 'TEMP B-TREE' not in details
+
+    def test_query_by_language(self, populated_kg):
+        """Should filter by metadata language via the indexed generated column."""
+        results = populated_kg.query_entities(language='python')
+
+        assert {e['name'] for e in results} == {'metasystem-core', 'python-lib'}
+        for entity in results:
+            assert entity['metadata']['language'] == 'python'
+            assert 'language' not in entity
+
     def test_query_by_name_like(self, populated_kg):
         """Should filter by name pattern."""
         results = populated_kg.query_entities(name_like='%typescript%')
@@ -348,8 +464,6 @@ class TestEntityQuery:
 
     def test_query_by_last_seen_since(self, tmp_kg):
         """Should filter by last_seen datetime."""
-        from datetime import datetime, timedelta
-
         # Insert entity
         entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
 
@@ -397,15 +511,19 @@ class TestFullTextSearch:
         for res in results:
             assert res['type'] == 'project'
 
+    def test_search_with_multiple_types(self, populated_kg):
+        """Should bind each type filter rather than interpolating it."""
+        results = populated_kg.search('python', types=['tool', 'project'])
+        quoted = populated_kg.search('python', types=["project') OR ('1'='1"])
+
+        assert {r['type'] for r in results} <= {'tool', 'project'}
+        assert len(results) > 0
+        assert quoted == []
+
     def test_search_with_limit(self, tmp_kg):
         """Should limit search results."""
-        # Insert many entities
-        for i in range(20):
-            tmp_kg.insert_entity({
-                'type': 'project',
-                'name': f'test-project-{i}',
-                'metadata': {'description': 'A test project'}
-            })
+        seed_entities(tmp_kg, 20, name_prefix='test-project',
+                      metadata={'description': 'A test project'})
 
         results = tmp_kg.search('test project', limit=5)
 
@@ -419,15 +537,24 @@ class TestFullTextSearch:
         assert results == []
 
     def test_search_empty_query(self, populated_kg):
-        """Should handle empty query gracefully."""
-        # Empty search may cause FTS syntax error - just verify it doesn't crash
-        try:
-            results = populated_kg.search('')
-            # If no error, results should be a list
-            assert isinstance(results, list)
-        except Exception:
-            # Empty query may not be supported - that's okay
-            pass
+        """Should return no results for empty or whitespace-only queries."""
+        assert populated_kg.search('') == []
+        assert populated_kg.search('   ') == []
+
+    def test_search_punctuation_is_literal(self, populated_kg):
+        """Hyphens, colons and quotes should not be parsed as FTS5 syntax."""
+        results = populated_kg.search('metasystem-core')
+
+        assert any(r['name'] == 'metasystem-core' for r in results)
+        assert populated_kg.search('type: "unterminated') == []
+
+    def test_search_ignores_diacritics(self, tmp_kg):
+        """Accented and unaccented spellings should match each other."""
+        entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'café-tools'})
+
+        results = tmp_kg.search('cafe')
+
+        assert [r['id'] for r in results] == [entity_id]
 
 
 # ============================================================================
@@ -492,14 +619,33 @@ class TestRelationships:
 
         assert len(rels) == 2
 
+    def test_get_relationships_both_directions_filtered_by_type(self, tmp_kg):
+        """Type filter should apply to both branches, counting self-loops once."""
+        entity1_id = tmp_kg.insert_entity({'type': 'project', 'name': 'proj1'})
+        entity2_id = tmp_kg.insert_entity({'type': 'tool', 'name': 'tool1'})
+
+        tmp_kg.add_relationships_bulk([
+            (entity1_id, entity2_id, 'uses'),
+            (entity2_id, entity1_id, 'uses'),
+            (entity2_id, entity1_id, 'used_by'),
+            (entity1_id, entity1_id, 'uses'),
+        ])
+
+        rels = tmp_kg.get_relationships(entity1_id, rel_type='uses', direction='both')
+
+        assert len(rels) == 3
+        assert all(r['rel_type'] == 'uses' for r in rels)
+
     def test_get_relationships_filtered_by_type(self, tmp_kg):
         """Should filter relationships by type."""
         entity1_id = tmp_kg.insert_entity({'type': 'project', 'name': 'proj1'})
         entity2_id = tmp_kg.insert_entity({'type': 'tool', 'name': 'tool1'})
         entity3_id = tmp_kg.insert_entity({'type': 'tool', 'name': 'tool2'})
 
-        tmp_kg.add_relationship(entity1_id, entity2_id, 'uses')
-        tmp_kg.add_relationship(entity1_id, entity3_id, 'requires')
+        tmp_kg.add_relationships_bulk([
+            (entity1_id, entity2_id, 'uses'),
+            (entity1_id, entity3_id, 'requires'),
+        ])
 
         # Get relationships filtered by type
         rels = tmp_kg.get_relationships(entity1_id, rel_type='uses', direction='outgoing')
@@ -508,6 +654,20 @@ class TestRelationships:
         assert rels[0]['rel_type'] == 'uses'
         assert rels[0]['target_id'] == entity2_id
 
+    def test_add_relationships_bulk(self, tmp_kg):
+        """Should insert all relationships with metadata in one call."""
+        entity1_id = tmp_kg.insert_entity({'type': 'project', 'name': 'proj1'})
+        entity2_id = tmp_kg.insert_entity({'type': 'tool', 'name': 'tool1'})
+
+        count = tmp_kg.add_relationships_bulk([
+            (entity1_id, entity2_id, 'uses', {'context': 'development'}),
+            (entity2_id, entity1_id, 'used_by'),
+        ])
+
+        assert count == 2
+        outgoing = tmp_kg.get_relationships(entity1_id, direction='outgoing')
+        assert outgoing[0]['metadata'] == {'context': 'development'}
+
     def test_delete_relationship(self, tmp_kg):
         """Should delete relationship."""
         entity1_id = tmp_kg.insert_entity({'type': 'project', 'name': 'proj1'})
@@ -537,9 +697,6 @@ class TestConversations:
 
     def test_insert_conversation(self, tmp_kg):
         """Should insert conversation."""
-        import uuid
-        from datetime import datetime
-
         conv_data = {
             'id': str(uuid.uuid4()),
             'tool': 'claude-code',
@@ -558,9 +715,6 @@ class TestConversations:
 
     def test_get_conversation(self, tmp_kg):
         """Should retrieve conversation."""
-        import uuid
-        from datetime import datetime
-
         conv_data = {
             'id': str(uuid.uuid4()),
             'tool': 'claude-code',
@@ -580,9 +734,6 @@ class TestConversations:
 
     def test_conversation_defaults(self, tmp_kg):
         """Should set default values for conversation."""
-        import uuid
-        from datetime import datetime
-
         conv_data = {
             'id': str(uuid.uuid4()),
             'tool': 'test-tool',
@@ -598,9 +749,6 @@ class TestConversations:
 
     def test_update_conversation(self, tmp_kg):
         """Should update conversation."""
-        import uuid
-        from datetime import datetime
-
         conv_data = {
             'id': str(uuid.uuid4()),
             'tool': 'test-tool',
@@ -625,9 +773,6 @@ class TestConversations:
 
     def test_query_conversations_by_tool(self, tmp_kg):
         """Should filter conversations by tool."""
-        import uuid
-        from datetime import datetime
-
         for tool in ['claude-code', 'chatgpt', 'claude-code']:
             tmp_kg.insert_conversation({
                 'id': str(uuid.uuid4()),
@@ -643,9 +788,6 @@ class TestConversations:
 
     def test_query_active_conversations(self, tmp_kg):
         """Should filter by active status (based on last_message_at)."""
-        import uuid
-        from datetime import datetime, timedelta
-
         # Active conversation (recent message)
         active_id = str(uuid.uuid4())
         tmp_kg.insert_conversation({
@@ -672,10 +814,6 @@ class TestConversations:
 
     def test_get_recent_conversations(self, tmp_kg):
         """Should get recent conversations ordered by time."""
-        import uuid
-        from datetime import datetime
-        import time
-
         # Insert conversations
         for i in range(5):
             tmp_kg.insert_conversation({
@@ -692,9 +830,6 @@ class TestConversations:
 
     def test_query_conversations_since(self, tmp_kg):
         """Should filter conversations by started_at datetime."""
-        import uuid
-        from datetime import datetime, timedelta
-
         # Insert old conversation
         old_time = (datetime.now() - timedelta(days=2)).isoformat()
         tmp_kg.insert_conversation({
@@ -720,9 +855,6 @@ class TestConversations:
 
     def test_query_inactive_conversations(self, tmp_kg):
         """Should filter for inactive conversations."""
-        import uuid
-        from datetime import datetime, timedelta
-
         # Active conversation
         tmp_kg.insert_conversation({
             'id': str(uuid.uuid4()),
@@ -774,21 +906,37 @@ class TestFacts:
         """Should retrieve facts for entity."""
         entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
 
-        tmp_kg.add_fact(entity_id, 'file_accessed', '/file1.py', 'tool-1')
-        tmp_kg.add_fact(entity_id, 'file_accessed', '/file2.py', 'tool-1')
-        tmp_kg.add_fact(entity_id, 'decision_made', 'Use pytest', 'tool-2')
+        tmp_kg.add_facts_bulk([
+            (entity_id, 'file_accessed', '/file1.py', 'tool-1'),
+            (entity_id, 'file_accessed', '/file2.py', 'tool-1'),
+            (entity_id, 'decision_made', 'Use pytest', 'tool-2'),
+        ])
 
         facts = tmp_kg.get_facts(entity_id)
 
         assert len(facts) == 3
 
+    def test_add_facts_bulk_confidence(self, tmp_kg):
+        """Should default confidence to 1.0 when omitted."""
+        entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
+
+        tmp_kg.add_facts_bulk([
+            (entity_id, 'file_accessed', '/file1.py', 'tool-1', 0.5),
+            (entity_id, 'decision_made', 'Use pytest', 'tool-2'),
+        ])
+
+        confidences = {f['fact_type']: f['confidence'] for f in tmp_kg.get_facts(entity_id)}
+        assert confidences == {'file_accessed': 0.5, 'decision_made': 1.0}
+
     def test_get_facts_filtered_by_type(self, tmp_kg):
         """Should filter facts by type."""
         entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
 
-        tmp_kg.add_fact(entity_id, 'file_accessed', '/file1.py', 'tool-1')
-        tmp_kg.add_fact(entity_id, 'file_accessed', '/file2.py', 'tool-1')
-        tmp_kg.add_fact(entity_id, 'decision_made', 'Use pytest', 'tool-2')
+        tmp_kg.add_facts_bulk([
+            (entity_id, 'file_accessed', '/file1.py', 'tool-1'),
+            (entity_id, 'file_accessed', '/file2.py', 'tool-1'),
+            (entity_id, 'decision_made', 'Use pytest', 'tool-2'),
+        ])
 
         facts = tmp_kg.get_facts(entity_id, fact_type='file_accessed')
 
@@ -796,6 +944,36 @@ class TestFacts:
         for fact in facts:
             assert fact['fact_type'] == 'file_accessed'
 
+    def test_find_entities_by_fact(self, tmp_kg):
+        """Should find entities by fact value, filtered by type and path."""
+        first = tmp_kg.insert_entity({'type': 'file', 'path': '/a.txt', 'name': 'a.txt'})
+        second = tmp_kg.insert_entity({'type': 'file', 'path': '/b.txt', 'name': 'b.txt'})
+        project = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
+
+        tmp_kg.add_facts_bulk([
+            (first, 'file_hash', 'abc', 'scan'),
+            (second, 'file_hash', 'abc', 'scan'),
+            (project, 'file_hash', 'abc', 'scan'),
+            (second, 'file_hash', 'def', 'scan'),
+        ])
+
+        found = tmp_kg.find_entities_by_fact('file_hash', 'abc', type='file', exclude_path='/a.txt')
+
+        assert [e['id'] for e in found] == [second]
+        assert tmp_kg.find_entities_by_fact('file_hash', 'missing') == []
+        assert tmp_kg.has_facts('file_hash') is True
+        assert tmp_kg.has_facts('missing') is False
+
+    def test_find_entities_by_fact_uses_index(self, tmp_kg):
+        """Fact lookup by type and value should use the composite index."""
+        plan = tmp_kg.conn.execute("""
+            EXPLAIN QUERY PLAN
+            SELECT * FROM facts WHERE fact_type = ? AND value = ?
+        """, ('file_hash', 'abc')).fetchall()
+        details = ' '.join(row[3] for row in plan)
+
+        assert 'idx_facts_type_value' in details
+
 
 # ============================================================================
 # Snapshot Tests
@@ -843,6 +1021,107 @@ class TestSnapshots:
             tmp_kg.create_snapshot('nonexistent-id')
 
 
+# ============================================================================
+# Activity Timestamp Tests
+# ============================================================================
+
+@pytest.mark.unit
+class TestLastSeenCoalescing:
+    """Test coalesced last_seen / last_message_at writes."""
+
+    def test_touch_defers_write_until_flush(self, tmp_kg):
+        """Should buffer touches and write them in one flush."""
+        entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
+        old_time = (datetime.now() - timedelta(hours=48)).isoformat()
+        tmp_kg.update_entity(entity_id, {'last_seen': old_time})
+
+        for _ in range(5):
+            tmp_kg.touch(entity_id)
+
+        stored = tmp_kg.conn.execute(
+            "SELECT last_seen FROM entities WHERE id = ?", (entity_id,)
+        ).fetchone()[0]
+        assert stored == old_time
+
+        assert tmp_kg.flush_last_seen() == 1
+        assert tmp_kg.get_entity(entity_id)['last_seen'] > old_time
+
+    def test_flush_skips_recently_seen(self, tmp_kg):
+        """Should not rewrite last_seen already within the threshold."""
+        entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
+        original = tmp_kg.get_entity(entity_id)['last_seen']
+
+        tmp_kg.touch(entity_id)
+
+        assert tmp_kg.flush_last_seen() == 0
+        assert tmp_kg.get_entity(entity_id)['last_seen'] == original
+
+    def test_query_flushes_pending_touches(self, tmp_kg):
+        """Should flush pending touches before filtering on last_seen."""
+        entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
+        old_time = (datetime.now() - timedelta(hours=48)).isoformat()
+        tmp_kg.update_entity(entity_id, {'last_seen': old_time})
+
+        tmp_kg.touch(entity_id)
+        recent = tmp_kg.query_entities(last_seen_hours=24)
+
+        assert [e['id'] for e in recent] == [entity_id]
+
+    def test_touch_conversation(self, tmp_kg):
+        """Should coalesce last_message_at updates for conversations."""
+        conv_id = str(uuid.uuid4())
+        old_time = (datetime.now() - timedelta(days=2)).isoformat()
+        tmp_kg.insert_conversation({
+            'id': conv_id,
+            'tool': 'test',
+            'started_at': old_time
+        })
+
+        tmp_kg.touch_conversation(conv_id)
+        tmp_kg.touch_conversation(conv_id)
+
+        assert tmp_kg.flush_last_seen() == 1
+        assert tmp_kg.get_conversation(conv_id)['last_message_at'] > old_time
+
+    def test_touch_flushes_in_background(self, tmp_kg):
+        """Pending touches should be written by the timer without another call."""
+        entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
+        old_time = (datetime.now() - timedelta(hours=48)).isoformat()
+        tmp_kg.update_entity(entity_id, {'last_seen': old_time})
+        tmp_kg.LAST_SEEN_FLUSH_INTERVAL = 0.05
+
+        tmp_kg.touch(entity_id)
+
+        deadline = time.monotonic() + 5
+        stored = old_time
+        while stored == old_time and time.monotonic() < deadline:
+            time.sleep(0.02)
+            stored = tmp_kg.conn.execute(
+                "SELECT last_seen FROM entities WHERE id = ?", (entity_id,)
+            ).fetchone()[0]
+
+        assert stored > old_time
+
+    def test_get_reflects_pending_touches(self, tmp_kg):
+        """get_entity/get_conversation should show touches not yet flushed."""
+        entity_id = tmp_kg.insert_entity({'type': 'project', 'name': 'test'})
+        conv_id = str(uuid.uuid4())
+        old_time = (datetime.now() - timedelta(days=2)).isoformat()
+        tmp_kg.update_entity(entity_id, {'last_seen': old_time})
+        tmp_kg.insert_conversation({
+            'id': conv_id,
+            'tool': 'test',
+            'started_at': old_time
+        })
+
+        tmp_kg.touch(entity_id)
+        tmp_kg.touch_conversation(conv_id)
+
+        assert tmp_kg.get_entity(entity_id)['last_seen'] > old_time
+        assert tmp_kg.get_conversation(conv_id)['last_message_at'] > old_time
+        assert tmp_kg.flush_last_seen() == 2
+
+
 # ============================================================================
 # Health & Maintenance Tests
 # ============================================================================
@@ -858,22 +1137,19 @@ class TestHealthMaintenance:
         assert isinstance(result, bool)
         assert result is True  # New database should be healthy
 
-    def test_vacuum(self, tmp_kg):
+    def test_vacuum(self, disk_kg):
         """Should vacuum database without errors."""
         # Add some data
-        for i in range(10):
-            tmp_kg.insert_entity({'type': 'test', 'name': f'entity-{i}'})
+        seed_entities(disk_kg, 10, entity_type='test', name_prefix='entity')
 
         # Delete some data
-        entities = tmp_kg.query_entities(type='test')
-        for entity in entities[:5]:
-            tmp_kg.delete_entity(entity['id'])
+        disk_kg.delete_entities_where(type='test', limit=5)
 
         # Vacuum should reclaim space
-        tmp_kg.vacuum()
+        disk_kg.vacuum()
 
         # Should still work after vacuum
-        remaining = tmp_kg.query_entities(type='test')
+        remaining = disk_kg.query_entities(type='test')
         assert len(remaining) == 5
 
     def test_get_stats(self, populated_kg):
@@ -896,6 +1172,16 @@ class TestHealthMaintenance:
         # entities_by_type should be a dict
         assert isinstance(stats['entities_by_type'], dict)
 
+    def test_get_stats_approximate(self, populated_kg):
+        """Should report row counts from sqlite_stat1 after ANALYZE."""
+        exact = populated_kg.get_stats()
+        populated_kg.vacuum()
+
+        approx = populated_kg.get_stats(approximate=True)
+
+        assert approx['total_entities'] == exact['total_entities']
+        assert approx['total_conversations'] == exact['total_conversations']
+
     def test_get_stats_empty_db(self, tmp_kg):
         """Should handle stats on empty database."""
         stats = tmp_kg.get_stats()
@@ -955,41 +1241,101 @@ class TestEdgeCases:
     def test_concurrent_inserts(self, tmp_kg):
         """Should handle concurrent insertions."""
         # Insert many entities rapidly
-        import threading
-
-        ids = []
-
         def insert_entity(index):
-            entity_id = tmp_kg.insert_entity({
+            return tmp_kg.insert_entity({
                 'type': 'project',
                 'name': f'project-{index}'
             })
-            ids.append(entity_id)
 
-        threads = []
-        for i in range(10):
-            t = threading.Thread(target=insert_entity, args=(i,))
-            threads.append(t)
-            t.start()
-
-        for t in threads:
-            t.join()
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            ids = list(executor.map(insert_entity, range(10)))
 
         # All inserts should succeed
         assert len(ids) == 10
         assert len(set(ids)) == 10  # All unique
+        assert count_entities(tmp_kg, 'project') == 10
 
-    def test_query_with_sql_injection_attempt(self, tmp_kg):
-        """Should safely handle SQL injection attempts."""
-        # Attempt SQL injection via path_like
-        malicious_path = "'; DROP TABLE entities; --"
+    def test_batch_rolls_back_on_error(self, tmp_kg):
+        """An exception inside batch() should discard every write in it."""
+        kept_id = tmp_kg.insert_entity({'type': 'project', 'name': 'kept'})
 
-        # Should not crash or drop table
-        results = tmp_kg.query_entities(path_like=malicious_path)
+        with pytest.raises(RuntimeError):
+            with tmp_kg.batch():
+                tmp_kg.insert_entity({'type': 'project', 'name': 'discarded'})
+                # A failed insert undoes only itself, not the batch
+                with pytest.raises(sqlite3.IntegrityError):
+                    tmp_kg.insert_entity({'id': kept_id, 'type': 'project'})
+                assert count_entities(tmp_kg, 'project') == 2
+                raise RuntimeError("abort batch")
+
+        assert count_entities(tmp_kg, 'project') == 1
+        assert tmp_kg.get_entity(kept_id) is not None
 
-        # Table should still exist
-        all_entities = tmp_kg.query_entities(limit=10)
-        # Should work (no exception)
+    def test_interrupted_transaction_rolls_back(self, disk_kg):
+        """An interrupt mid-transaction shouldn't leave later writes uncommitted."""
+        with pytest.raises(KeyboardInterrupt):
+            with disk_kg._get_conn() as conn:
+                conn.execute("DELETE FROM entities")
+                raise KeyboardInterrupt
+
+        assert not disk_kg.conn.in_transaction
+
+        entity_id = disk_kg.insert_entity({'type': 'project', 'name': 'after'})
+
+        other = KnowledgeGraph(disk_kg.db_path)
+        try:
+            assert other.get_entity(entity_id)['name'] == 'after'
+        finally:
+            other.close()
+
+    def test_batch_makes_other_threads_wait(self, tmp_kg):
+        """Another thread's write should wait for a batch, not join it."""
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        with pytest.raises(RuntimeError):
+            with tmp_kg.batch():
+                tmp_kg.insert_entity({'type': 'project', 'name': 'discarded'})
+                other = executor.submit(
+                    tmp_kg.insert_entity, {'type': 'project', 'name': 'other'}
+                )
+                with pytest.raises(TimeoutError):
+                    other.result(timeout=0.2)
+                raise RuntimeError("abort batch")
+
+        # The other thread's insert ran after the rollback and was kept
+        other_id = other.result(timeout=5)
+        executor.shutdown()
+        assert count_entities(tmp_kg, 'project') == 1
+        assert tmp_kg.get_entity(other_id)['name'] == 'other'
+
+    def test_concurrent_inserts_are_combined(self, tmp_kg):
+        """Queued inserts should be written together; a bad row fails alone."""
+        existing_id = tmp_kg.insert_entity({'type': 'project', 'name': 'existing'})
+        errors = []
+
+        def insert_entity(entity):
+            try:
+                tmp_kg.insert_entity(entity)
+            except sqlite3.IntegrityError as e:
+                errors.append(e)
+
+        entities = [{'type': 'tool', 'name': f'tool-{i}'} for i in range(4)]
+        entities.append({'id': existing_id, 'type': 'tool', 'name': 'duplicate'})
+
+        # Hold the connection so every thread queues before any writes
+        with tmp_kg._conn_lock:
+            threads = [threading.Thread(target=insert_entity, args=(e,)) for e in entities]
+            for t in threads:
+                t.start()
+            while len(tmp_kg._insert_queue) < len(entities):
+                time.sleep(0.001)
+
+        for t in threads:
+            t.join()
+
+        assert len(errors) == 1
+        assert count_entities(tmp_kg, 'tool') == 4
+        assert len(tmp_kg.search('tool', limit=100)) == 4
 
     def test_empty_database_queries(self, tmp_kg):
         """Should handle queries on empty database."""
@@ -997,3 +1343,21 @@ class TestEdgeCases:
         assert tmp_kg.query_entities() == []
         assert tmp_kg.search('anything') == []
         assert tmp_kg.get_recent_conversations() == []
+
+
+@pytest.mark.unit
+@pytest.mark.readonly
+class TestEdgeCasesReadOnly:
+    """Edge cases that only read, sharing one class-scoped knowledge graph."""
+
+    def test_query_with_sql_injection_attempt(self, readonly_kg):
+        """Should safely handle SQL injection attempts."""
+        # Attempt SQL injection via path_like
+        malicious_path = "'; DROP TABLE entities; --"
+
+        # Should not crash or drop table
+        results = readonly_kg.query_entities(path_like=malicious_path)
+
+        assert results == []
+        # Table and its contents should still exist
+        assert readonly_kg.get_entity('readonly-project') is not None
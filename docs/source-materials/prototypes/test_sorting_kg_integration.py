@@ -5,16 +5,17 @@ Integration tests for SortingDaemon + KnowledgeGraph interaction.
 Tests how file organization interacts with metadata tracking.
 """
 
+import filecmp
 import pytest
 import tempfile
 from pathlib import Path
-import yaml
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from knowledge_graph import KnowledgeGraph
 from sorting_daemon import SortingDaemon
+from tests.test_helpers import write_yaml_config
 
 
 # ============================================================================
@@ -46,8 +47,7 @@ class TestSortingKGIntegration:
         }
 
         config_path = tmp_path / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         kg_path = tmp_path / "test.db"
         kg = KnowledgeGraph(str(kg_path))
@@ -112,8 +112,7 @@ class TestSortingKGIntegration:
         }
 
         config_path = tmp_path / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         kg_path = tmp_path / "test.db"
         kg = KnowledgeGraph(str(kg_path))
@@ -160,8 +159,7 @@ class TestSortingKGIntegration:
         }
 
         config_path = tmp_path / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         kg_path = tmp_path / "test.db"
         daemon = SortingDaemon(str(config_path), str(kg_path))
@@ -185,9 +183,9 @@ class TestSortingKGIntegration:
         stats = daemon.scan_directory(inbox, dry_run=False)
         
         # Based on duplicate_action, file2 might be skipped or handled
-        # The hash cache should work correctly
-        assert daemon._compute_file_hash(tmp_path / "archive/file1.txt") == \
-               daemon._compute_file_hash(file2) if file2.exists() else True
+        # A file2 left in place must still match the archived original
+        if file2.exists():
+            assert filecmp.cmp(tmp_path / "archive/file1.txt", file2, shallow=False)
 
     def test_kg_entity_creation_for_organized_files(self, tmp_path):
         """Test that organizing files creates proper entities in KG."""
@@ -210,8 +208,7 @@ class TestSortingKGIntegration:
         }
 
         config_path = tmp_path / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         kg_path = tmp_path / "test.db"
         kg = KnowledgeGraph(str(kg_path))
@@ -258,8 +255,7 @@ class TestSortingKGIntegration:
         }
 
         config_path = tmp_path / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         kg_path = tmp_path / "test.db"
         kg = KnowledgeGraph(str(kg_path))
@@ -301,8 +297,7 @@ class TestSortingKGIntegration:
         }
 
         config_path = tmp_path / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         kg_path = tmp_path / "test.db"
         kg = KnowledgeGraph(str(kg_path))
@@ -347,8 +342,7 @@ class TestSortingKGPerformance:
         }
 
         config_path = tmp_path / "config.yaml"
-        with open(config_path, 'w') as f:
-            yaml.dump(config, f)
+        write_yaml_config(config_path, config)
 
         kg_path = tmp_path / "test.db"
         kg = KnowledgeGraph(str(kg_path))
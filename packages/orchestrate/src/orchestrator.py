@@ -15,11 +15,13 @@ import argparse
 import json
 import os
 import sys
+import time
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict, field
+from dataclasses import dataclass, asdict, field, replace
 import logging
+import aiohttp
 import yaml
 
 # Add src to path for imports
@@ -29,7 +31,7 @@ from services import (
     PerplexityHandler, GeminiHandler, ChatGPTHandler, 
     CopilotHandler, GrokHandler
 )
-from utils import PromptLibrary, ResultAggregator, GateValidator
+from utils import PromptLibrary, ResultAggregator, GateValidator, ResponseCache, write_json
 
 # Configure logging
 logging.basicConfig(
@@ -40,9 +42,9 @@ logging.basicConfig(
 logger = logging.getLogger("orchestrator")
 
 
-@dataclass
+@dataclass(frozen=True)
 class PhaseConfig:
-    """Configuration for a single phase."""
+    """Configuration for a single phase (use dataclasses.replace to vary it)."""
     name: str
     phase_number: int
     tasks: List[str]
@@ -60,13 +62,15 @@ class OrchestratorConfig:
     prompts_dir: str = "./prompts"
     service_config: Dict[str, Dict[str, Any]] = field(default_factory=dict)
     phases: List[PhaseConfig] = field(default_factory=list)
+    cache_ttl_seconds: int = 0  # 0 disables response caching
+    cache_max_entries: int = 256
 
 
 class OmniOrchestrator:
     """Main orchestration engine."""
     
-    # Default phase configurations
-    DEFAULT_PHASES = [
+    # Default phase configurations, shared by all instances
+    DEFAULT_PHASES = (
         PhaseConfig(
             name="research_validation",
             phase_number=1,
@@ -125,7 +129,35 @@ class OmniOrchestrator:
             parallel_limit=2,
             timeout_seconds=300,
         ),
-    ]
+    )
+    
+    # Default phases by name, for run_single_phase
+    PHASES_BY_NAME = {phase.name: phase for phase in DEFAULT_PHASES}
+    
+    # Longest warmup() waits on each handler's asynchronous setup. A
+    # handler's own network calls have tighter limits (see
+    # BaseHandler.WARMUP_TIMEOUT_SECONDS). SDK imports run synchronously
+    # on the event loop, so their time is not bounded by this.
+    HANDLER_WARMUP_TIMEOUT_SECONDS = 30
+    
+    # Rough per-service usage for estimate_costs:
+    # (service, tasks, tokens_per_task, cost_per_1k)
+    COST_ESTIMATES = (
+        ("perplexity", 2, 3000, 0.002),
+        ("gemini", 2, 8000, 0.00125),
+        ("chatgpt", 4, 4000, 0.01),
+        ("copilot", 2, 3000, 0.01),
+        ("grok", 2, 3000, 0.005),
+    )
+    
+    # Prompt template folder for each phase
+    PHASE_FOLDERS = {
+        "research_validation": "phase1_research",
+        "spec_hardening": "phase2_specification",
+        "messaging_synthesis": "phase3_messaging",
+        "implementation_planning": "phase4_implementation",
+        "vulnerability_audit": "phase5_vulnerability",
+    }
     
     def __init__(self, config_path: Optional[str] = None):
         """Initialize orchestrator with configuration."""
@@ -140,10 +172,26 @@ class OmniOrchestrator:
         self.services: Dict[str, Any] = {}
         self._initialize_services()
         
+        # Pooled keep-alive HTTP session shared by the HTTP-based handlers;
+        # created on first use, since it must belong to the running loop
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
         # Initialize utilities
         self.aggregator = ResultAggregator()
         self.gate_validator = GateValidator()
         
+        # Results of earlier identical requests; loaded from the output
+        # directory on first use, since the CLI may still change it
+        self.response_cache = ResponseCache(
+            max_entries=self.config.cache_max_entries,
+            ttl_seconds=self.config.cache_ttl_seconds
+        )
+        self._cache_loaded = False
+        
+        # Requests currently being sent, by cache key, so identical
+        # concurrent prompts share one call
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
         # Track execution state
         self.current_phase: Optional[int] = None
         self.execution_log: List[Dict[str, Any]] = []
@@ -160,6 +208,8 @@ class OmniOrchestrator:
             config.output_dir = yaml_config.get("output_dir", config.output_dir)
             config.prompts_dir = yaml_config.get("prompts_dir", config.prompts_dir)
             config.service_config = yaml_config.get("service_config", {})
+            config.cache_ttl_seconds = yaml_config.get("cache_ttl_seconds", config.cache_ttl_seconds)
+            config.cache_max_entries = yaml_config.get("cache_max_entries", config.cache_max_entries)
             
             # API keys from config file (may reference env vars)
             api_keys = yaml_config.get("api_keys", {})
@@ -200,6 +250,56 @@ class OmniOrchestrator:
             api_key = self.config.api_keys.get(name, "")  # allow-secret
             self.services[name] = handler_class(api_key)
     
+    def _ensure_http_session(self) -> aiohttp.ClientSession:
+        """Create the shared HTTP session and hand it to every handler."""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=32,
+                    limit_per_host=16,
+                    keepalive_timeout=30
+                ),
+                timeout=aiohttp.ClientTimeout(total=None, connect=10)
+            )
+            for handler in self.services.values():
+                handler.http_session = self._http_session
+        return self._http_session
+    
+    @property
+    def _cache_path(self) -> Path:
+        return self.output_dir / ".cache.json"
+    
+    def _ensure_cache_loaded(self) -> None:
+        """Load the persisted response cache once, if caching is enabled."""
+        if self._cache_loaded or not self.response_cache.enabled:
+            return
+        self.response_cache.load_from_file(self._cache_path)
+        self._cache_loaded = True
+    
+    async def warmup(self) -> None:
+        """
+        Set up every configured service before the first phase, so SDK
+        imports, DNS lookups and TLS handshakes don't delay its tasks.
+        Failures are logged and left for the real request to report.
+        Network setup is bounded by HANDLER_WARMUP_TIMEOUT_SECONDS. SDK
+        imports block the event loop while they run and are not bounded.
+        """
+        self._ensure_http_session()
+        available = [h for h in self.services.values() if h.is_available()]
+        results = await asyncio.gather(
+            *(asyncio.wait_for(handler.warmup(), timeout=self.HANDLER_WARMUP_TIMEOUT_SECONDS)
+              for handler in available),
+            return_exceptions=True
+        )
+        for handler, result in zip(available, results):
+            if isinstance(result, asyncio.TimeoutError):
+                logger.warning(
+                    f"Warmup for {handler.SERVICE_NAME} timed out after "
+                    f"{self.HANDLER_WARMUP_TIMEOUT_SECONDS}s"
+                )
+            elif isinstance(result, Exception):
+                logger.warning(f"Warmup failed for {handler.SERVICE_NAME}: {result}")
+    
     async def run_phase(
         self, 
         phase: PhaseConfig, 
@@ -219,6 +319,12 @@ class OmniOrchestrator:
         """
         logger.info(f"Starting Phase {phase.phase_number}: {phase.name}")
         self.current_phase = phase.phase_number
+        started = time.monotonic()
+        self._ensure_http_session()
+        
+        # Created once here; result and gate writes below assume it exists
+        self._phase_dir(phase).mkdir(parents=True, exist_ok=True)
+        self._ensure_cache_loaded()
         
         # Prepare tasks
         tasks = []
@@ -251,26 +357,63 @@ class OmniOrchestrator:
         semaphore = asyncio.Semaphore(phase.parallel_limit)
         
         async def bounded_execute(task_name, handler, prompt):
-            async with semaphore:
-                return await handler.execute(
-                    prompt=prompt,
-                    task_name=task_name,
-                    timeout=phase.timeout_seconds
-                )
-        
-        # Run all tasks
-        coroutines = [
-            bounded_execute(task_name, handler, prompt)
-            for task_name, _, handler, prompt in tasks
-        ]
+            cache_key = ResponseCache.make_key(
+                handler.SERVICE_NAME, handler.config.model, prompt
+            )
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"[{handler.SERVICE_NAME}] {task_name} served from cache")
+                return {**cached, "task": task_name}
+            
+            # Same prompt already on its way: wait for that call instead
+            inflight = self._inflight.get(cache_key)
+            if inflight is not None:
+                logger.info(f"[{handler.SERVICE_NAME}] {task_name} joined identical request")
+                result = await asyncio.shield(inflight)
+                return {**result, "task": task_name}
+            
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[cache_key] = future
+            try:
+                async with semaphore:
+                    result = await handler.execute(
+                        prompt=prompt,
+                        task_name=task_name,
+                        timeout=phase.timeout_seconds
+                    )
+            except BaseException as e:
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # Retrieved here; waiters re-raise it
+                raise
+            else:
+                future.set_result(result)
+            finally:
+                del self._inflight[cache_key]
+            
+            # Errors are not cached, so a re-run retries them
+            if result.get("status") == "success":
+                self.response_cache.set(cache_key, result)
+            return result
         
-        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        async def run_task(task_name, service_name, handler, prompt):
+            try:
+                result = await bounded_execute(task_name, handler, prompt)
+            except Exception as e:
+                result = e
+            return task_name, service_name, result
         
-        # Process results
+        # Run all tasks; each result is saved as soon as it arrives instead
+        # of after the slowest task
         phase_results = {}
-        for (task_name, service_name, _, _), result in zip(tasks, results):
+        raised = set()
+        for next_done in asyncio.as_completed([run_task(*task) for task in tasks]):
+            task_name, service_name, result = await next_done
             if isinstance(result, Exception):
                 logger.error(f"Task {task_name} failed with exception: {result}")
+                raised.add(task_name)
                 phase_results[task_name] = {
                     "status": "error",
                     "error": str(result),
@@ -278,7 +421,22 @@ class OmniOrchestrator:
                 }
             else:
                 phase_results[task_name] = result
-                self._save_result(phase, task_name, result)
+                # A failed write is recorded against its task; raising here
+                # would orphan the tasks as_completed is still running
+                try:
+                    await self._save_result(phase, task_name, result)
+                except Exception as e:
+                    logger.error(f"Failed to save result for {task_name}: {e}")
+                    phase_results[task_name] = {**result, "save_error": str(e)}
+        
+        # Back in task order for the aggregator and the gate, so reports
+        # don't depend on which service answered first
+        phase_results = {
+            task_name: phase_results[task_name]
+            for task_name, _, _, _ in tasks
+        }
+        for task_name, result in phase_results.items():
+            if task_name not in raised:
                 self.aggregator.add_result(phase.name, task_name, result)
         
         # Log execution
@@ -290,7 +448,8 @@ class OmniOrchestrator:
                 1 for r in phase_results.values() 
                 if r.get("status") == "success"
             ),
-            "timestamp": datetime.utcnow().isoformat() + "Z"
+            "duration_seconds": round(time.monotonic() - started, 3),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
         })
         
         # Gate validation
@@ -303,16 +462,13 @@ class OmniOrchestrator:
         logger.info(f"Phase {phase.phase_number} complete")
         return True
     
+    def _phase_dir(self, phase: PhaseConfig) -> Path:
+        """Output directory for a phase's results."""
+        return self.output_dir / f"phase{phase.phase_number}_{phase.name}"
+    
     def _phase_to_folder(self, phase_name: str) -> str:
         """Convert phase name to folder name."""
-        folder_map = {
-            "research_validation": "phase1_research",
-            "spec_hardening": "phase2_specification",
-            "messaging_synthesis": "phase3_messaging",
-            "implementation_planning": "phase4_implementation",
-            "vulnerability_audit": "phase5_vulnerability",
-        }
-        return folder_map.get(phase_name, phase_name)
+        return self.PHASE_FOLDERS.get(phase_name, phase_name)
     
     async def _validate_gate(
         self, 
@@ -330,17 +486,15 @@ class OmniOrchestrator:
         logger.info(f"Gate {phase.phase_number} validation: {validation['status']}")
         
         # Save gate result
-        gate_path = self.output_dir / f"phase{phase.phase_number}_{phase.name}" / "gate_result.json"
-        gate_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(gate_path, 'w') as f:
-            json.dump(validation, f, indent=2)
+        gate_path = self._phase_dir(phase) / "gate_result.json"
+        await asyncio.to_thread(self._write_json, gate_path, validation)
         
         if pause:
             print(f"\n{'='*60}")
             print(f"GATE {phase.phase_number} REVIEW")
             print(f"{'='*60}")
             print(f"Status: {validation['status']}")
-            print(f"Output directory: {self.output_dir / f'phase{phase.phase_number}_{phase.name}'}")
+            print(f"Output directory: {self._phase_dir(phase)}")
             
             if validation.get('recommendations'):
                 print("\nRecommendations:")
@@ -362,22 +516,28 @@ class OmniOrchestrator:
         
         return validation['pass']
     
-    def _save_result(self, phase: PhaseConfig, task_name: str, result: Dict[str, Any]) -> None:
-        """Save task result to output directory."""
-        phase_dir = self.output_dir / f"phase{phase.phase_number}_{phase.name}"
-        phase_dir.mkdir(parents=True, exist_ok=True)
+    @staticmethod
+    def _write_json(path: Path, data: Dict[str, Any]) -> None:
+        """Write data as indented JSON."""
+        write_json(path, data)
+    
+    async def _save_result(self, phase: PhaseConfig, task_name: str, result: Dict[str, Any]) -> None:
+        """Save task result to output directory.
+        
+        Files are written on a worker thread so requests still in flight
+        keep being serviced meanwhile.
+        """
+        phase_dir = self._phase_dir(phase)
         
         # Save JSON
         json_path = phase_dir / f"{task_name}.json"
-        with open(json_path, 'w') as f:
-            json.dump(result, f, indent=2, default=str)
+        await asyncio.to_thread(self._write_json, json_path, result)
         
         # Save markdown content if present
         content = result.get("content")
         if content:
             md_path = phase_dir / f"{task_name}.md"
-            with open(md_path, 'w') as f:
-                f.write(content)
+            await asyncio.to_thread(md_path.write_text, content)
         
         logger.info(f"Saved result: {json_path}")
     
@@ -398,12 +558,10 @@ class OmniOrchestrator:
         Returns:
             True if all phases completed successfully
         """
-        phases = self.DEFAULT_PHASES.copy()
-        
-        # Update gate requirements based on argument
-        for phase in phases:
-            if not gates:
-                phase.gate_required = False
+        # Gates disabled: run copies, leaving the shared defaults untouched
+        phases = self.DEFAULT_PHASES
+        if not gates:
+            phases = tuple(replace(phase, gate_required=False) for phase in phases)
         
         for phase in phases:
             success = await self.run_phase(phase, context, pause_at_gates)
@@ -422,25 +580,26 @@ class OmniOrchestrator:
         context: Optional[Dict[str, Any]] = None
     ) -> bool:
         """Run a single phase by name."""
-        phase_map = {p.name: p for p in self.DEFAULT_PHASES}
+        phase = self.PHASES_BY_NAME.get(phase_name)
         
-        if phase_name not in phase_map:
+        if phase is None:
             logger.error(f"Unknown phase: {phase_name}")
-            logger.info(f"Available phases: {list(phase_map.keys())}")
+            logger.info(f"Available phases: {list(self.PHASES_BY_NAME.keys())}")
             return False
         
-        return await self.run_phase(phase_map[phase_name], context, pause_at_gate)
+        return await self.run_phase(phase, context, pause_at_gate)
     
     async def _generate_synthesis_report(self) -> None:
         """Generate and save executive synthesis report."""
         report = await self.aggregator.synthesize()
         
         report_path = self.output_dir / "EXECUTIVE_REPORT.md"
-        with open(report_path, 'w') as f:
-            f.write(report)
+        await asyncio.to_thread(report_path.write_text, report)
         
         # Also save aggregated data
-        self.aggregator.save_to_file(self.output_dir / "aggregated_results.json")
+        await asyncio.to_thread(
+            self.aggregator.save_to_file, self.output_dir / "aggregated_results.json"
+        )
         
         logger.info(f"Executive report saved: {report_path}")
     
@@ -453,23 +612,14 @@ class OmniOrchestrator:
     
     def estimate_costs(self) -> Dict[str, Any]:
         """Estimate API costs for full pipeline run."""
-        # Rough estimates based on typical usage
-        estimates = {
-            "perplexity": {"tasks": 2, "tokens_per_task": 3000, "cost_per_1k": 0.002},
-            "gemini": {"tasks": 2, "tokens_per_task": 8000, "cost_per_1k": 0.00125},
-            "chatgpt": {"tasks": 4, "tokens_per_task": 4000, "cost_per_1k": 0.01},
-            "copilot": {"tasks": 2, "tokens_per_task": 3000, "cost_per_1k": 0.01},
-            "grok": {"tasks": 2, "tokens_per_task": 3000, "cost_per_1k": 0.005},
-        }
-        
         total = 0
         breakdown = {}
         
-        for service, params in estimates.items():
-            tokens = params["tasks"] * params["tokens_per_task"]
-            cost = (tokens / 1000) * params["cost_per_1k"]
+        for service, tasks, tokens_per_task, cost_per_1k in self.COST_ESTIMATES:
+            tokens = tasks * tokens_per_task
+            cost = (tokens / 1000) * cost_per_1k
             breakdown[service] = {
-                "tasks": params["tasks"],
+                "tasks": tasks,
                 "estimated_tokens": tokens,
                 "estimated_cost_usd": round(cost, 2)
             }
@@ -486,6 +636,13 @@ class OmniOrchestrator:
         for handler in self.services.values():
             if hasattr(handler, 'close'):
                 await handler.close()
+        
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+        
+        if self._cache_loaded and len(self.response_cache):
+            self.response_cache.save_to_file(self._cache_path)
 
 
 def main():
@@ -609,6 +766,8 @@ Examples:
         
         async def run():
             try:
+                await orchestrator.warmup()
+                
                 if args.phase == "all":
                     success = await orchestrator.run_all_phases(
                         gates=gates,
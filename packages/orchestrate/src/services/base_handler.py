@@ -52,10 +52,21 @@ class BaseHandler(ABC):
     
     SERVICE_NAME: str = "base"
     
-    def __init__(self, api_key: str, config: Optional[ServiceConfig] = None):  # allow-secret
+    # Longest warmup() waits for its keep-alive connection to the service
+    WARMUP_TIMEOUT_SECONDS: float = 5.0
+    
+    def __init__(
+        self,
+        api_key: str,  # allow-secret
+        config: Optional[ServiceConfig] = None,
+        http_session: Optional[Any] = None
+    ):
         self.api_key = api_key  # allow-secret
         self.config = config or self._default_config()
         self._client = None
+        # Shared aiohttp.ClientSession owned by the caller; HTTP-based
+        # handlers use it instead of opening (and closing) their own
+        self.http_session = http_session
         
     @abstractmethod
     def _default_config(self) -> ServiceConfig:
@@ -168,6 +179,15 @@ class BaseHandler(ABC):
             }
         }
     
+    async def warmup(self) -> None:
+        """
+        Do one-time setup ahead of the first request: initialize the
+        client, which imports the provider SDK where there is one.
+        Subclasses may also open a connection to the service.
+        """
+        if self._client is None:
+            await self._initialize_client()
+    
     def is_available(self) -> bool:
         """Check if service is available (API key is set)."""
         return bool(self.api_key and self.api_key.strip())
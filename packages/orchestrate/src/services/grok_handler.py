@@ -11,6 +11,7 @@ Grok excels at:
 
 from typing import Optional, Dict, Any
 import aiohttp
+import asyncio
 import json
 import logging
 
@@ -34,13 +35,26 @@ class GrokHandler(BaseHandler):
         )
     
     async def _initialize_client(self) -> None:
-        """Initialize aiohttp session for Grok API."""
-        self._client = aiohttp.ClientSession(
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-        )
+        """Initialize aiohttp session for Grok API (the shared one, if given)."""
+        self._client = self.http_session or aiohttp.ClientSession()
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    async def warmup(self) -> None:
+        """Initialize the session and open a keep-alive connection to the API."""
+        await super().warmup()
+        try:
+            # Any status will do: this only resolves DNS and does the TLS handshake
+            async with self._client.head(
+                self.API_BASE,
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=self.WARMUP_TIMEOUT_SECONDS)
+            ):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"[{self.SERVICE_NAME}] warmup connection failed: {e}")
     
     async def _send_request(self, prompt: str, **kwargs) -> ServiceResponse:
         """Send request to Grok API."""
@@ -70,7 +84,8 @@ You're the skeptic the project needs, not the cheerleader it wants.""")
         try:
             async with self._client.post(
                 f"{self.API_BASE}/chat/completions",
-                json=payload
+                json=payload,
+                headers=self._headers
             ) as response:
                 
                 if response.status != 200:
@@ -193,9 +208,10 @@ Output narrative and structured JSON."""
         return await self.execute(prompt, task_name)
     
     async def close(self) -> None:
-        """Close the aiohttp session."""
+        """Close the aiohttp session, unless it is the shared one."""
         if self._client:
-            await self._client.close()
+            if self._client is not self.http_session:
+                await self._client.close()
             self._client = None
 
 
@@ -10,6 +10,7 @@ Perplexity excels at:
 
 from typing import Optional, Dict, Any
 import aiohttp
+import asyncio
 import json
 import logging
 
@@ -33,13 +34,26 @@ class PerplexityHandler(BaseHandler):
         )
     
     async def _initialize_client(self) -> None:
-        """Initialize aiohttp session for Perplexity API."""
-        self._client = aiohttp.ClientSession(
-            headers={
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-        )
+        """Initialize aiohttp session for Perplexity API (the shared one, if given)."""
+        self._client = self.http_session or aiohttp.ClientSession()
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+    
+    async def warmup(self) -> None:
+        """Initialize the session and open a keep-alive connection to the API."""
+        await super().warmup()
+        try:
+            # Any status will do: this only resolves DNS and does the TLS handshake
+            async with self._client.head(
+                self.API_BASE,
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=self.WARMUP_TIMEOUT_SECONDS)
+            ):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"[{self.SERVICE_NAME}] warmup connection failed: {e}")
     
     async def _send_request(self, prompt: str, **kwargs) -> ServiceResponse:
         """Send request to Perplexity API."""
@@ -65,7 +79,8 @@ class PerplexityHandler(BaseHandler):
         try:
             async with self._client.post(
                 f"{self.API_BASE}/chat/completions",
-                json=payload
+                json=payload,
+                headers=self._headers
             ) as response:
                 
                 if response.status != 200:
@@ -116,9 +131,10 @@ class PerplexityHandler(BaseHandler):
             )
     
     async def close(self) -> None:
-        """Close the aiohttp session."""
+        """Close the aiohttp session, unless it is the shared one."""
         if self._client:
-            await self._client.close()
+            if self._client is not self.http_session:
+                await self._client.close()
             self._client = None
 
 
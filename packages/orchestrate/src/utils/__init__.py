@@ -5,6 +5,8 @@ Utility modules for orchestration.
 from .prompt_templates import PromptLibrary, PROMPT_LIBRARY, load_prompt, get_prompt_library
 from .result_aggregator import ResultAggregator
 from .gate_validator import GateValidator, GateResult
+from .response_cache import ResponseCache
+from .json_io import write_json
 
 __all__ = [
     "PromptLibrary",
@@ -14,4 +16,6 @@ __all__ = [
     "ResultAggregator",
     "GateValidator",
     "GateResult",
+    "ResponseCache",
+    "write_json",
 ]
@@ -0,0 +1,31 @@
+"""
+JSON file output for results, gates and aggregated reports.
+Uses orjson when installed and falls back to the standard library.
+"""
+
+from pathlib import Path
+from typing import Any
+import json
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def write_json(path: Path, data: Any) -> None:
+    """
+    Write data to path as indented JSON.
+    Values JSON can't represent are written as str(value).
+    """
+    if HAS_ORJSON:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(
+                data,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
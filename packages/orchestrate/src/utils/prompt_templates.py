@@ -22,11 +22,13 @@ class PromptLibrary:
         
     def _load_template(self, phase: str, task: str) -> str:
         """Load a template file from disk."""
-        # Try multiple extensions
+        # Try multiple extensions; opening directly saves an exists() stat
         for ext in [".txt", ".md", ".prompt"]:
             path = self.prompts_dir / phase / f"{task}{ext}"
-            if path.exists():
+            try:
                 return path.read_text(encoding="utf-8")
+            except FileNotFoundError:
+                continue
         
         raise FileNotFoundError(
             f"Template not found: {phase}/{task} "
@@ -0,0 +1,107 @@
+"""
+Response cache for service calls.
+Lets re-runs of a phase reuse answers to prompts that were already sent,
+instead of calling the service again.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """
+    LRU cache of successful task results with a time-to-live.
+    Entries are keyed by a hash of service, model and prompt, and can be
+    persisted to a JSON file between runs.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 0):
+        """
+        Args:
+            max_entries: Oldest entries are evicted beyond this many
+            ttl_seconds: How long an entry stays valid; 0 disables the cache
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    @staticmethod
+    def make_key(service: str, model: str, prompt: str) -> str:
+        """Build the cache key for a prompt sent to a service model."""
+        raw = "\x00".join((service, model, prompt))
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for key, or None if missing or expired."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry["expires_at"] <= time.time():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return entry["result"]
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result, evicting the least recently used entry if full."""
+        if not self.enabled:
+            return
+
+        self._entries[key] = {
+            "result": result,
+            "expires_at": time.time() + self.ttl_seconds
+        }
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save_to_file(self, path: Path) -> None:
+        """Persist unexpired entries to a JSON file."""
+        now = time.time()
+        entries = {
+            key: entry for key, entry in self._entries.items()
+            if entry["expires_at"] > now
+        }
+
+        with open(path, 'w') as f:
+            json.dump(entries, f, default=str)
+
+    def load_from_file(self, path: Path) -> None:
+        """Load unexpired entries saved by save_to_file, if the file exists."""
+        if not path.exists():
+            return
+
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable response cache {path}: {e}")
+            return
+
+        now = time.time()
+        for key, entry in entries.items():
+            if entry.get("expires_at", 0) > now:
+                self._entries[key] = entry
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -9,6 +9,8 @@ from pathlib import Path
 import json
 import logging
 
+from .json_io import write_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -263,8 +265,7 @@ class ResultAggregator:
             "summary": self.generate_summary()
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(output, f, indent=2, default=str)
+        write_json(output_path, output)
         
         logger.info(f"Saved aggregated results to {output_path}")
     
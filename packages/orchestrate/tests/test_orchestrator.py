@@ -0,0 +1,106 @@
+"""
+Tests for OmniOrchestrator.run_phase, using a stub service handler.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from orchestrator import OmniOrchestrator, PhaseConfig
+
+
+class StubHandler:
+    """Service handler that answers every task without a network call."""
+
+    SERVICE_NAME = "stub"
+
+    def __init__(self, delays=None):
+        self.config = SimpleNamespace(model="stub-model")
+        self.http_session = None
+        self.delays = delays or {}
+
+    def is_available(self) -> bool:
+        return True
+
+    async def execute(self, prompt, task_name, timeout=None):
+        await asyncio.sleep(self.delays.get(task_name, 0))
+        return {
+            "status": "success",
+            "service": self.SERVICE_NAME,
+            "task": task_name,
+            "content": f"Answer for {task_name}",
+        }
+
+
+@pytest.fixture
+def orchestrator(tmp_path, monkeypatch):
+    """Orchestrator writing under tmp_path, with one stub service."""
+    monkeypatch.chdir(tmp_path)
+    orch = OmniOrchestrator()
+    orch.services = {"stub": StubHandler(delays={"first": 0.05})}
+    return orch
+
+
+def make_phase(tasks):
+    return PhaseConfig(
+        name="test_phase",
+        phase_number=1,
+        tasks=tasks,
+        services={task: "stub" for task in tasks},
+        gate_required=False,
+        parallel_limit=len(tasks),
+    )
+
+
+def run_phase(orch, phase):
+    async def run():
+        try:
+            return await orch.run_phase(phase)
+        finally:
+            await orch.cleanup()
+
+    return asyncio.run(run())
+
+
+# ============================================================================
+# run_phase
+# ============================================================================
+
+class TestRunPhase:
+    """Test task execution, saving and aggregation in run_phase."""
+
+    def test_aggregates_in_task_order(self, orchestrator):
+        """Results should reach the aggregator in task order, not completion order."""
+        phase = make_phase(["first", "second", "third"])
+
+        assert run_phase(orchestrator, phase) is True
+
+        aggregated = orchestrator.aggregator.results["test_phase"]
+        assert list(aggregated) == ["first", "second", "third"]
+        assert (orchestrator._phase_dir(phase) / "first.md").read_text() == "Answer for first"
+
+    def test_failed_save_does_not_abort_phase(self, orchestrator, monkeypatch):
+        """A result that can't be written should be recorded, not end the phase."""
+        phase = make_phase(["first", "second", "third"])
+        saved = []
+
+        async def save_result(phase, task_name, result):
+            if task_name == "second":
+                raise OSError("No space left on device")
+            saved.append(task_name)
+
+        monkeypatch.setattr(orchestrator, "_save_result", save_result)
+
+        assert run_phase(orchestrator, phase) is True
+
+        assert sorted(saved) == ["first", "third"]
+        aggregated = orchestrator.aggregator.results["test_phase"]
+        assert list(aggregated) == ["first", "second", "third"]
+        assert aggregated["second"]["save_error"] == "No space left on device"
+        assert "save_error" not in aggregated["first"]
+        assert orchestrator.execution_log[-1]["tasks_succeeded"] == 3